@@ -96,16 +96,19 @@ def selection_sort(arr):
 
 
 def heapify(arr, n, i):
-    largest = i
-    l = 2*i + 1
-    r = 2*i + 2
-    if l < n and arr[l] > arr[largest]:
-        largest = l
-    if r < n and arr[r] > arr[largest]:
-        largest = r
-    if largest != i:
+    # Iterative sift-down: follow the larger child until the heap property holds
+    while True:
+        largest = i
+        l = 2*i + 1
+        r = 2*i + 2
+        if l < n and arr[l] > arr[largest]:
+            largest = l
+        if r < n and arr[r] > arr[largest]:
+            largest = r
+        if largest == i:
+            return
         arr[i], arr[largest] = arr[largest], arr[i]
-        heapify(arr, n, largest)
+        i = largest
 
 
 def heap_sort(arr):
@@ -179,7 +182,9 @@ def fractional_knapsack(weights, values, capacity):
     return max_value
 
 
-def dijkstra(graph, start):
+def dijkstra(graph, start, pq_class=None):
+    if pq_class is not None:
+        return _dijkstra_decrease_key(graph, start, pq_class)
     distances = {node: float('inf') for node in graph}
     distances[start] = 0
     pq = []
@@ -198,6 +203,24 @@ def dijkstra(graph, start):
     return distances
 
 
+# Addressable-queue variant: one entry per node, updated with decrease_key
+
+
+def _dijkstra_decrease_key(graph, start, pq_class):
+    distances = {node: float('inf') for node in graph}
+    distances[start] = 0
+    pq = pq_class()
+    pq.insert(start, 0)
+    while not pq.is_empty():
+        current_distance, current_node = pq.extract_min()
+        for neighbor, weight in graph[current_node].items():
+            distance = current_distance + weight
+            if distance < distances[neighbor]:
+                distances[neighbor] = distance
+                pq.push_or_decrease(neighbor, distance)
+    return distances
+
+
 def kruskal(graph):
     parent = {}
     rank = {}
@@ -231,7 +254,9 @@ def kruskal(graph):
     return mst
 
 
-def prim(graph, start):
+def prim(graph, start, pq_class=None):
+    if pq_class is not None:
+        return _prim_decrease_key(graph, start, pq_class)
     mst = []
     visited = set([start])
     nodes = list(graph.keys())
@@ -251,6 +276,27 @@ def prim(graph, start):
     return mst
 
 
+# Each unvisited vertex keeps only its cheapest (weight, u, v) candidate, so
+# extraction order matches the list-based version without stale entries
+
+
+def _prim_decrease_key(graph, start, pq_class):
+    mst = []
+    visited = set([start])
+    pq = pq_class()
+    for v, w in graph[start].items():
+        if v not in visited:
+            pq.push_or_decrease(v, (w, start, v))
+    while not pq.is_empty():
+        (w, u, v), _ = pq.extract_min()
+        visited.add(v)
+        mst.append((u, v, w))
+        for to_next, weight in graph[v].items():
+            if to_next not in visited:
+                pq.push_or_decrease(to_next, (weight, v, to_next))
+    return mst
+
+
 def huffman_coding(symbols, frequencies):
     nodes = [[freq, [sym, ""]] for sym, freq in zip(symbols, frequencies)]
     while len(nodes) > 1:
@@ -0,0 +1,270 @@
+import argparse
+import json
+import math
+import random
+import sys
+import time
+
+import algorithms
+from priority_queues import random_graph
+
+# Benchmark suite for algorithms.py
+#
+# Every case times one routine on generated inputs over a sweep of sizes,
+# keeps the best of `repeat` runs per size and fits the empirical complexity
+# exponent k in t ~ c * n^k (least squares on log t vs log n). Results can be
+# saved as a JSON baseline and later runs compared against it; a case
+# regresses when its times grow past the threshold or its exponent climbs.
+#
+#   python benchmarks.py                        run and print every case
+#   python benchmarks.py --save baseline.json   record a baseline
+#   python benchmarks.py --compare baseline.json --threshold 0.25
+#                                               exit 1 on any regression
+#
+# Baselines are only meaningful on the machine that recorded them.
+
+ARRAY_KINDS = ('random', 'sorted', 'reversed', 'few_unique')
+DEFAULT_THRESHOLD = 0.25
+DEFAULT_EXPONENT_TOLERANCE = 0.3
+
+
+# Input generators
+
+
+def array_input(kind, n, seed=0):
+    rng = random.Random(seed)
+    if kind == 'few_unique':
+        return [rng.randrange(8) for _ in range(n)]
+    data = [rng.randrange(n * 4) for _ in range(n)]
+    if kind == 'sorted':
+        data.sort()
+    elif kind == 'reversed':
+        data.sort(reverse=True)
+    elif kind != 'random':
+        raise ValueError(f"unknown array kind {kind!r}")
+    return data
+
+
+def graph_input(density, n, seed=0):
+    # Sparse graphs have a constant average degree, dense ones grow it with n
+    # so the edge count is quadratic; both are connected and undirected
+    if density == 'sparse':
+        return random_graph(n, 4, seed=seed)
+    if density == 'dense':
+        return random_graph(n, max(4, n // 8), seed=seed)
+    raise ValueError(f"unknown graph density {density!r}")
+
+
+def edge_list(graph):
+    # Kruskal's {'vertices', 'edges'} form of a dict-of-dicts graph
+    edges = [(u, v, w) for u, adjacent in graph.items() for v, w in adjacent.items() if u < v]
+    return {'vertices': list(graph), 'edges': edges}
+
+
+def adjacency_lists(graph):
+    # bfs/dfs take plain neighbor lists
+    return {u: list(adjacent) for u, adjacent in graph.items()}
+
+
+# Cases: (name, setup(n, seed) -> args, func, sizes). setup runs outside the
+# timer and is called again for every repeat, so in-place sorts always see
+# fresh input.
+
+
+def _sort_setup(kind):
+    return lambda n, seed: (array_input(kind, n, seed),)
+
+
+def _linear_search_setup(n, seed):
+    rng = random.Random(seed)
+    arr = array_input('random', n, seed)
+    return arr, [rng.randrange(n * 4) for _ in range(100)]
+
+
+def _binary_search_setup(n, seed):
+    rng = random.Random(seed)
+    arr = array_input('sorted', n, seed)
+    return arr, [rng.randrange(n * 4) for _ in range(10000)]
+
+
+def _run_searches(search):
+    return lambda arr, targets: [search(arr, t) for t in targets]
+
+
+def _knapsack_setup(n, seed):
+    rng = random.Random(seed)
+    weights = [rng.randint(1, 100) for _ in range(n)]
+    values = [rng.randint(1, 100) for _ in range(n)]
+    return weights, values, sum(weights) // 2
+
+
+def _huffman_setup(n, seed):
+    rng = random.Random(seed)
+    return list(range(n)), [rng.randint(1, 1000) for _ in range(n)]
+
+
+def _graph_setup(density, convert=None):
+    def setup(n, seed):
+        graph = graph_input(density, n, seed)
+        if convert is not None:
+            graph = convert(graph)
+        return (graph,) if convert is edge_list else (graph, 0)
+    return setup
+
+
+def _dfs(graph, start):
+    # dfs recurses once per vertex on the current path
+    limit = sys.getrecursionlimit()
+    sys.setrecursionlimit(max(limit, 2 * len(graph) + 100))
+    try:
+        return algorithms.dfs(graph, start)
+    finally:
+        sys.setrecursionlimit(limit)
+
+
+def default_cases():
+    cases = []
+    quadratic = (250, 500, 1000, 2000)
+    linearithmic = (4000, 16000, 64000)
+    for name in ('bubble_sort', 'insertion_sort', 'selection_sort'):
+        for kind in ARRAY_KINDS:
+            cases.append((f'{name}/{kind}', _sort_setup(kind), getattr(algorithms, name), quadratic))
+    for name in ('quick_sort', 'merge_sort', 'heap_sort'):
+        for kind in ARRAY_KINDS:
+            cases.append((f'{name}/{kind}', _sort_setup(kind), getattr(algorithms, name), linearithmic))
+    cases.append(('linear_search/100 queries', _linear_search_setup,
+                  _run_searches(algorithms.linear_search), (2000, 8000, 32000)))
+    cases.append(('binary_search/10000 queries', _binary_search_setup,
+                  _run_searches(algorithms.binary_search), (4000, 64000, 1024000)))
+    cases.append(('fractional_knapsack', _knapsack_setup, algorithms.fractional_knapsack,
+                  (10000, 40000, 160000)))
+    cases.append(('huffman_coding', _huffman_setup, algorithms.huffman_coding, (128, 256, 512, 1024)))
+    # The list-backed priority queue makes dijkstra and prim superlinear in
+    # the queue length, so they get smaller sweeps; sizes are (sparse, dense)
+    graphs = [
+        ('dijkstra', algorithms.dijkstra, None, (500, 1000, 2000, 4000), (125, 250, 500)),
+        ('prim', algorithms.prim, None, (250, 500, 1000, 2000), (60, 125, 250)),
+        ('kruskal', algorithms.kruskal, edge_list, (2000, 8000, 32000), (250, 500, 1000)),
+        ('bfs', algorithms.bfs, adjacency_lists, (2000, 4000, 8000, 16000), (125, 250, 500)),
+        ('dfs', _dfs, adjacency_lists, (2000, 8000, 32000), (250, 500, 1000)),
+    ]
+    for name, func, convert, sparse, dense in graphs:
+        cases.append((f'{name}/sparse', _graph_setup('sparse', convert), func, sparse))
+        cases.append((f'{name}/dense', _graph_setup('dense', convert), func, dense))
+    return cases
+
+
+# Measurement
+
+
+def fit_exponent(sizes, seconds):
+    # Slope of the least-squares line through (log n, log t)
+    points = [(math.log(n), math.log(t)) for n, t in zip(sizes, seconds) if t > 0]
+    if len(points) < 2:
+        return float('nan')
+    mean_x = sum(x for x, _ in points) / len(points)
+    mean_y = sum(y for _, y in points) / len(points)
+    sxx = sum((x - mean_x) ** 2 for x, _ in points)
+    sxy = sum((x - mean_x) * (y - mean_y) for x, y in points)
+    return sxy / sxx if sxx else float('nan')
+
+
+def time_case(setup, func, n, repeat=3, seed=0):
+    best = float('inf')
+    for _ in range(repeat):
+        args = setup(n, seed)
+        t0 = time.perf_counter()
+        func(*args)
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+
+def run(cases=None, repeat=3, scale=1.0, pattern=None, seed=0, progress=None):
+    # Returns {case: {'sizes': [...], 'seconds': [...], 'exponent': k}};
+    # scale shrinks or grows every size sweep, pattern selects cases by
+    # substring
+    results = {}
+    for name, setup, func, sizes in cases or default_cases():
+        if pattern and pattern not in name:
+            continue
+        sizes = [max(2, int(n * scale)) for n in sizes]
+        seconds = [time_case(setup, func, n, repeat, seed) for n in sizes]
+        results[name] = {'sizes': sizes, 'seconds': seconds, 'exponent': fit_exponent(sizes, seconds)}
+        if progress is not None:
+            progress(name, results[name])
+    return results
+
+
+# Baselines and regression gates
+
+
+def save_baseline(results, path):
+    with open(path, 'w') as f:
+        json.dump({'python': sys.version.split()[0], 'cases': results}, f, indent=2, sort_keys=True)
+
+
+def load_baseline(path):
+    with open(path) as f:
+        return json.load(f)['cases']
+
+
+def compare(results, baseline, threshold=DEFAULT_THRESHOLD, exponent_tolerance=DEFAULT_EXPONENT_TOLERANCE):
+    # A case regresses when the geometric mean of current/baseline times over
+    # the sizes both runs measured exceeds 1 + threshold, or when its fitted
+    # exponent grew by more than exponent_tolerance. Returns a list of
+    # (case, ratio, old_exponent, new_exponent, regressed).
+    report = []
+    for name, current in results.items():
+        old = baseline.get(name)
+        if old is None:
+            continue
+        old_times = dict(zip(old['sizes'], old['seconds']))
+        ratios = [t / old_times[n] for n, t in zip(current['sizes'], current['seconds'])
+                  if old_times.get(n, 0) > 0 and t > 0]
+        if not ratios:
+            continue
+        ratio = math.exp(sum(map(math.log, ratios)) / len(ratios))
+        old_k = old['exponent']
+        new_k = current['exponent']
+        regressed = ratio > 1 + threshold or (
+            not math.isnan(old_k) and not math.isnan(new_k) and new_k - old_k > exponent_tolerance)
+        report.append((name, ratio, old_k, new_k, regressed))
+    return report
+
+
+def _print_case(name, result):
+    times = ' '.join(f'{n}:{t * 1000:.2f}ms' for n, t in zip(result['sizes'], result['seconds']))
+    print(f"{name:<32}{result['exponent']:>7.2f}  {times}", flush=True)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the routines in algorithms.py")
+    parser.add_argument('--cases', help="only run cases whose name contains this string")
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--scale', type=float, default=1.0, help="multiply every input size")
+    parser.add_argument('--save', metavar='PATH', help="write the results as a JSON baseline")
+    parser.add_argument('--compare', metavar='PATH', help="compare against a JSON baseline")
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD)
+    parser.add_argument('--exponent-tolerance', type=float, default=DEFAULT_EXPONENT_TOLERANCE)
+    args = parser.parse_args(argv)
+
+    print(f"{'case':<32}{'exp':>7}  size:time")
+    results = run(repeat=args.repeat, scale=args.scale, pattern=args.cases, progress=_print_case)
+    if args.save:
+        save_baseline(results, args.save)
+        print("Saved baseline to", args.save)
+    if args.compare:
+        report = compare(results, load_baseline(args.compare), args.threshold, args.exponent_tolerance)
+        print(f"\n{'case':<32}{'ratio':>8}{'exp was':>9}{'exp now':>9}")
+        for name, ratio, old_k, new_k, regressed in report:
+            flag = '  REGRESSED' if regressed else ''
+            print(f"{name:<32}{ratio:>8.2f}{old_k:>9.2f}{new_k:>9.2f}{flag}")
+        failed = [name for name, *_, regressed in report if regressed]
+        if failed:
+            print(f"{len(failed)} case(s) regressed past the threshold")
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,215 @@
+from array import array
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# Compressed sparse row (CSR) graph
+#
+# Vertex labels are mapped to dense ids 0..n-1. The neighbors of vertex v are
+# neighbors[offsets[v]:offsets[v + 1]], stored as int32 (offsets are int64 so
+# graphs with more than 2**31 edges still fit). With NumPy installed the
+# arrays are ndarrays, otherwise array.array buffers.
+
+
+class CSRGraph:
+    def __init__(self, offsets, neighbors, weights=None, labels=None):
+        self.offsets = offsets
+        self.neighbors = neighbors
+        self.weights = weights
+        self.labels = labels
+        self._ids = None
+
+    @property
+    def num_vertices(self):
+        return len(self.offsets) - 1
+
+    @property
+    def num_edges(self):
+        return len(self.neighbors)
+
+    def vertex_id(self, label):
+        if self.labels is None:
+            return label
+        if self._ids is None:
+            self._ids = {label: i for i, label in enumerate(self.labels)}
+        return self._ids[label]
+
+    def label(self, vertex):
+        return vertex if self.labels is None else self.labels[vertex]
+
+    def neighbors_of(self, vertex):
+        return self.neighbors[self.offsets[vertex]:self.offsets[vertex + 1]]
+
+    @classmethod
+    def from_dict(cls, graph):
+        # Accepts the dict-of-lists format used by bfs/dfs and the
+        # dict-of-dicts format used by dijkstra/prim (weights are kept)
+        labels = list(graph)
+        ids = {label: i for i, label in enumerate(labels)}
+        for adjacent in graph.values():
+            for neighbor in adjacent:
+                if neighbor not in ids:
+                    ids[neighbor] = len(labels)
+                    labels.append(neighbor)
+        weighted = any(isinstance(adjacent, dict) for adjacent in graph.values())
+        offsets = array('q', [0])
+        neighbors = array('i')
+        weights = array('d') if weighted else None
+        for label in labels:
+            adjacent = graph.get(label, ())
+            neighbors.extend(ids[neighbor] for neighbor in adjacent)
+            if weighted:
+                weights.extend(adjacent.values() if isinstance(adjacent, dict) else [1.0] * len(adjacent))
+            offsets.append(len(neighbors))
+        g = cls(*_as_buffers(offsets, neighbors, weights), labels=labels)
+        g._ids = ids
+        return g
+
+    @classmethod
+    def from_edge_arrays(cls, num_vertices, sources, targets):
+        # Builds the CSR arrays straight from integer edge lists, without a
+        # dict-of-lists ever being materialized. Edge order within a vertex
+        # follows the input order.
+        if np is not None:
+            sources = np.asarray(sources, dtype=np.int64)
+            targets = np.asarray(targets, dtype=np.int32)
+            order = np.argsort(sources, kind='stable')
+            counts = np.bincount(sources, minlength=num_vertices)
+            offsets = np.zeros(num_vertices + 1, dtype=np.int64)
+            np.cumsum(counts, out=offsets[1:])
+            return cls(offsets, targets[order])
+        counts = array('q', bytes(8 * (num_vertices + 1)))
+        for s in sources:
+            counts[s + 1] += 1
+        for v in range(num_vertices):
+            counts[v + 1] += counts[v]
+        cursor = array('q', counts)
+        neighbors = array('i', bytes(4 * len(targets)))
+        for s, t in zip(sources, targets):
+            neighbors[cursor[s]] = t
+            cursor[s] += 1
+        return cls(counts, neighbors)
+
+
+def _as_buffers(offsets, neighbors, weights):
+    if np is None:
+        return offsets, neighbors, weights
+    return (np.frombuffer(offsets, dtype=np.int64),
+            np.frombuffer(neighbors, dtype=np.int32),
+            None if weights is None else np.frombuffer(weights, dtype=np.float64))
+
+
+# Graph Traversal Algorithms on CSR graphs
+
+
+def bfs_levels(graph, start):
+    # Yields one frontier (array of vertex ids) per BFS level. Each level is
+    # expanded with a single gather over the frontier's adjacency ranges, and
+    # only the visited bitmap plus the current frontier are kept alive.
+    source = graph.vertex_id(start)
+    if np is None:
+        yield from _bfs_levels_python(graph, source)
+        return
+    offsets = graph.offsets
+    neighbors = graph.neighbors
+    visited = np.zeros(graph.num_vertices, dtype=np.bool_)
+    visited[source] = True
+    frontier = np.array([source], dtype=np.int32)
+    while frontier.size:
+        yield frontier
+        starts = offsets[frontier]
+        counts = offsets[frontier + 1] - starts
+        total = int(counts.sum())
+        if total == 0:
+            break
+        # Index of every edge leaving the frontier, in frontier order
+        shift = np.repeat(starts - np.cumsum(counts) + counts, counts)
+        gathered = neighbors[shift + np.arange(total)]
+        gathered = gathered[~visited[gathered]]
+        # Keep first occurrences only so the order matches queue-based BFS
+        _, first = np.unique(gathered, return_index=True)
+        frontier = gathered[np.sort(first)]
+        visited[frontier] = True
+
+
+def _bfs_levels_python(graph, source):
+    offsets = graph.offsets
+    neighbors = graph.neighbors
+    visited = bytearray(graph.num_vertices)
+    visited[source] = 1
+    frontier = array('i', [source])
+    while frontier:
+        yield frontier
+        next_frontier = array('i')
+        for v in frontier:
+            for k in range(offsets[v], offsets[v + 1]):
+                u = neighbors[k]
+                if not visited[u]:
+                    visited[u] = 1
+                    next_frontier.append(u)
+        frontier = next_frontier
+
+
+def csr_bfs(graph, start):
+    order = []
+    for frontier in bfs_levels(graph, start):
+        order.extend(graph.label(int(v)) for v in frontier)
+    return order
+
+
+def iter_dfs(graph, start):
+    # Iterative preorder DFS. The explicit stack holds (vertex, next edge)
+    # pairs, so the visiting order is the same as the recursive dfs but depth
+    # is limited only by memory.
+    offsets = graph.offsets
+    neighbors = graph.neighbors
+    visited = bytearray(graph.num_vertices)
+    source = graph.vertex_id(start)
+    visited[source] = 1
+    yield source
+    stack_v = array('i', [source])
+    stack_k = array('q', [offsets[source]])
+    while stack_v:
+        v = stack_v[-1]
+        k = stack_k[-1]
+        end = offsets[v + 1]
+        while k < end and visited[neighbors[k]]:
+            k += 1
+        if k == end:
+            stack_v.pop()
+            stack_k.pop()
+            continue
+        u = int(neighbors[k])
+        stack_k[-1] = k + 1
+        visited[u] = 1
+        yield u
+        stack_v.append(u)
+        stack_k.append(offsets[u])
+
+
+def csr_dfs(graph, start):
+    return [graph.label(v) for v in iter_dfs(graph, start)]
+
+
+if __name__ == "__main__":
+    from algorithms import bfs, dfs
+
+    graph_bfs = {
+        'A': ['B', 'C'],
+        'B': ['A', 'D', 'E'],
+        'C': ['A', 'F'],
+        'D': ['B'],
+        'E': ['B', 'F'],
+        'F': ['C', 'E']
+    }
+    g = CSRGraph.from_dict(graph_bfs)
+    print("CSR BFS:", csr_bfs(g, 'A'), "matches bfs:", csr_bfs(g, 'A') == bfs(graph_bfs, 'A'))
+    print("CSR DFS:", csr_dfs(g, 'A'), "matches dfs:", csr_dfs(g, 'A') == dfs(graph_bfs, 'A'))
+
+    # A path deep enough to overflow the recursive dfs
+    n = 200000
+    path = CSRGraph.from_edge_arrays(n, range(n - 1), range(1, n))
+    print("Path DFS depth:", sum(1 for _ in iter_dfs(path, 0)))
+    print("Path BFS levels:", sum(1 for _ in bfs_levels(path, 0)))
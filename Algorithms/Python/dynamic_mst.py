@@ -0,0 +1,489 @@
+import random
+import time
+
+from mst import kruskal_arrays
+
+# Dynamic minimum spanning forest
+#
+# DynamicMST keeps an MST (a forest if the graph is disconnected) up to date
+# while edges are added, removed or reweighted, instead of rerunning kruskal
+# or prim on the whole graph. The tree edges live in a link-cut tree where
+# every edge is its own node carrying its weight, so the heaviest edge on
+# the tree path between two vertices is an O(log n) amortized query:
+#   add_edge / weight decrease - cycle property: the new edge replaces the
+#       heaviest edge on the path between its endpoints if it is lighter,
+#       O(log n) amortized
+#   remove_edge / weight increase of a tree edge - the edge is cut and the
+#       lightest non-tree edge leaving the smaller of the two halves takes its
+#       place. Finding that half walks both halves in lockstep, so the cost is
+#       the size (and incident edges) of the smaller half: small for most
+#       cuts, O(n + m) in the worst case.
+# Edges are undirected and identified by their endpoint pair; parallel
+# edges collapse into the lightest one, both in the input graph and when
+# add_edge is called for a pair that already has an edge (update_weight is
+# the way to make an edge heavier).
+
+
+class LinkCutTree:
+    # Splay-tree based link-cut tree over nodes 0..n-1 with a value per node;
+    # best[x] is the node with the largest value in x's splay subtree
+    def __init__(self):
+        self.left = []
+        self.right = []
+        self.parent = []
+        self.flip = []
+        self.value = []
+        self.best = []
+
+    def add_node(self, value):
+        self.left.append(-1)
+        self.right.append(-1)
+        self.parent.append(-1)
+        self.flip.append(False)
+        self.value.append(value)
+        self.best.append(len(self.value) - 1)
+        return len(self.value) - 1
+
+    def reset_node(self, x, value):
+        self.left[x] = self.right[x] = self.parent[x] = -1
+        self.flip[x] = False
+        self.value[x] = value
+        self.best[x] = x
+
+    def _is_root(self, x):
+        p = self.parent[x]
+        return p == -1 or (self.left[p] != x and self.right[p] != x)
+
+    def _update(self, x):
+        value = self.value
+        best = self.best
+        b = x
+        child = self.left[x]
+        if child != -1 and value[best[child]] > value[b]:
+            b = best[child]
+        child = self.right[x]
+        if child != -1 and value[best[child]] > value[b]:
+            b = best[child]
+        best[x] = b
+
+    def _push(self, x):
+        if self.flip[x]:
+            left = self.left[x]
+            right = self.right[x]
+            self.left[x] = right
+            self.right[x] = left
+            if left != -1:
+                self.flip[left] = not self.flip[left]
+            if right != -1:
+                self.flip[right] = not self.flip[right]
+            self.flip[x] = False
+
+    def _rotate(self, x):
+        left, right, parent = self.left, self.right, self.parent
+        p = parent[x]
+        g = parent[p]
+        if not self._is_root(p):
+            if left[g] == p:
+                left[g] = x
+            else:
+                right[g] = x
+        parent[x] = g
+        if left[p] == x:
+            child = right[x]
+            left[p] = child
+            right[x] = p
+        else:
+            child = left[x]
+            right[p] = child
+            left[x] = p
+        if child != -1:
+            parent[child] = p
+        parent[p] = x
+        self._update(p)
+        self._update(x)
+
+    def _splay(self, x):
+        # Pending reversals are pushed down from the top of the splay tree
+        path = [x]
+        while not self._is_root(path[-1]):
+            path.append(self.parent[path[-1]])
+        for y in reversed(path):
+            self._push(y)
+        left, parent = self.left, self.parent
+        while not self._is_root(x):
+            p = parent[x]
+            if not self._is_root(p):
+                g = parent[p]
+                self._rotate(p if (left[g] == p) == (left[p] == x) else x)
+            self._rotate(x)
+
+    def _access(self, x):
+        last = -1
+        y = x
+        while y != -1:
+            self._splay(y)
+            self.right[y] = last
+            self._update(y)
+            last = y
+            y = self.parent[y]
+        self._splay(x)
+
+    def make_root(self, x):
+        self._access(x)
+        self.flip[x] = not self.flip[x]
+
+    def find_root(self, x):
+        self._access(x)
+        while True:
+            self._push(x)
+            if self.left[x] == -1:
+                break
+            x = self.left[x]
+        self._splay(x)
+        return x
+
+    def connected(self, u, v):
+        return u == v or self.find_root(u) == self.find_root(v)
+
+    def link(self, u, v):
+        self.make_root(u)
+        self.parent[u] = v
+
+    def cut(self, u, v):
+        # u and v must be adjacent in the represented tree
+        self.make_root(u)
+        self._access(v)
+        self.left[v] = -1
+        self.parent[u] = -1
+        self._update(v)
+
+    def path_max(self, u, v):
+        self.make_root(u)
+        self._access(v)
+        return self.best[v]
+
+    def set_value(self, x, value):
+        self._access(x)
+        self.value[x] = value
+        self._update(x)
+
+
+class DynamicMST:
+    def __init__(self, graph=None, mst=None):
+        # graph in either kruskal or prim format; mst, if given, is the output
+        # of kruskal or prim on it
+        self.lct = LinkCutTree()
+        self.vertex_ids = {}
+        self.total_weight = 0
+        # key -> [u, v, w, node, seq]; node is the link-cut node of a tree
+        # edge or -1, seq breaks weight ties between replacement candidates
+        self._edges = {}
+        self._incident = {}
+        self._tree_records = {}
+        self._free = []
+        self._seq = 0
+        if graph is None:
+            return
+        if 'vertices' in graph and 'edges' in graph:
+            vertices = graph['vertices']
+            edges = graph['edges']
+        else:
+            vertices = list(graph)
+            edges = [(u, v, w) for u, adjacent in graph.items() for v, w in adjacent.items()]
+        for vertex in vertices:
+            self._vertex(vertex)
+        # Counted before any edge node exists, so vertex ids are 0..n-1
+        components = self._component_count(edges)
+        if mst is None:
+            mst = kruskal_arrays(graph)
+        for u, v, w in mst:
+            self._link(self._record(u, v, w))
+        if len(mst) == len(self.vertex_ids) - components:
+            # A spanning forest (kruskal, or prim on a connected graph): the
+            # remaining edges go straight in as non-tree edges
+            for u, v, w in edges:
+                record = self._edges.get(self._key(u, v))
+                if record is None:
+                    self._record(u, v, w)
+                elif w < record[2]:
+                    self.update_weight(u, v, w)
+            return
+        # Otherwise (prim from one start vertex on a disconnected graph)
+        # insert the rest in weight order so every component gets its tree
+        for u, v, w in sorted(edges, key=lambda edge: edge[2]):
+            record = self._edges.get(self._key(u, v))
+            if record is None:
+                self.add_edge(u, v, w)
+            elif w < record[2]:
+                self.update_weight(u, v, w)
+
+    def _component_count(self, edges):
+        from mst import UnionFind
+        ids = self.vertex_ids
+        for u, v, _ in edges:
+            self._vertex(u)
+            self._vertex(v)
+        uf = UnionFind(len(ids))
+        components = len(ids)
+        for u, v, _ in edges:
+            if uf.union(ids[u], ids[v]):
+                components -= 1
+        return components
+
+    @staticmethod
+    def _key(u, v):
+        return frozenset((u, v))
+
+    def _vertex(self, label):
+        node = self.vertex_ids.get(label)
+        if node is None:
+            node = self.vertex_ids[label] = self.lct.add_node(float('-inf'))
+            self._incident[label] = set()
+        return node
+
+    def _record(self, u, v, w):
+        self._vertex(u)
+        self._vertex(v)
+        self._seq += 1
+        key = self._key(u, v)
+        record = self._edges[key] = [u, v, w, -1, self._seq]
+        self._incident[u].add(key)
+        self._incident[v].add(key)
+        return record
+
+    def _link(self, record):
+        u, v, w = record[0], record[1], record[2]
+        if self._free:
+            node = self._free.pop()
+            self.lct.reset_node(node, w)
+        else:
+            node = self.lct.add_node(w)
+        record[3] = node
+        self._tree_records[node] = record
+        self.lct.link(self.vertex_ids[u], node)
+        self.lct.link(node, self.vertex_ids[v])
+        self.total_weight += w
+
+    def _cut(self, record):
+        node = record[3]
+        self.lct.cut(self.vertex_ids[record[0]], node)
+        self.lct.cut(node, self.vertex_ids[record[1]])
+        self._free.append(node)
+        del self._tree_records[node]
+        record[3] = -1
+        self.total_weight -= record[2]
+
+    def _insert(self, record):
+        # Cycle property: the edge joins the forest unless it would close a
+        # cycle on which it is the heaviest edge
+        a = self.vertex_ids[record[0]]
+        b = self.vertex_ids[record[1]]
+        if a == b:
+            return
+        if not self.lct.connected(a, b):
+            self._link(record)
+            return
+        heaviest = self.lct.path_max(a, b)
+        if record[2] < self.lct.value[heaviest]:
+            self._cut(self._tree_records[heaviest])
+            self._link(record)
+
+    def _smaller_side(self, u, v):
+        # Walks the trees of u and v one vertex at a time in lockstep; the
+        # first walk to run out has visited the smaller side in full
+        edges = self._edges
+        incident = self._incident
+        seen = ({u}, {v})
+        stacks = ([u], [v])
+        while True:
+            for side in (0, 1):
+                stack = stacks[side]
+                if not stack:
+                    return seen[side]
+                x = stack.pop()
+                for key in incident[x]:
+                    record = edges[key]
+                    if record[3] != -1:
+                        y = record[1] if record[0] == x else record[0]
+                        if y not in seen[side]:
+                            seen[side].add(y)
+                            stack.append(y)
+
+    def _reconnect(self, u, v):
+        # After the tree edge (u, v) is cut, the lightest non-tree edge
+        # leaving the smaller of the two trees restores the minimum forest
+        side = self._smaller_side(u, v)
+        edges = self._edges
+        best = None
+        for x in side:
+            for key in self._incident[x]:
+                record = edges[key]
+                if record[3] == -1:
+                    y = record[1] if record[0] == x else record[0]
+                    if y not in side and (best is None or (record[2], record[4]) < (best[2], best[4])):
+                        best = record
+        if best is not None:
+            self._link(best)
+        return best
+
+    def add_edge(self, u, v, w):
+        record = self._edges.get(self._key(u, v))
+        if record is not None:
+            if w < record[2]:
+                self.update_weight(u, v, w)
+            return
+        self._insert(self._record(u, v, w))
+
+    def remove_edge(self, u, v):
+        key = self._key(u, v)
+        record = self._edges.pop(key, None)
+        if record is None:
+            raise KeyError((u, v))
+        self._incident[record[0]].discard(key)
+        self._incident[record[1]].discard(key)
+        if record[3] != -1:
+            self._cut(record)
+            self._reconnect(record[0], record[1])
+
+    def update_weight(self, u, v, w):
+        record = self._edges.get(self._key(u, v))
+        if record is None:
+            raise KeyError((u, v))
+        old = record[2]
+        if record[3] != -1:
+            if w <= old:
+                # A lighter tree edge stays in the tree
+                record[2] = w
+                self.lct.set_value(record[3], w)
+                self.total_weight += w - old
+            else:
+                # A heavier one competes with every edge across its cut,
+                # itself included
+                self._cut(record)
+                record[2] = w
+                self._reconnect(record[0], record[1])
+        else:
+            record[2] = w
+            if w < old:
+                self._insert(record)
+
+    def has_edge(self, u, v):
+        return self._key(u, v) in self._edges
+
+    def edges(self):
+        return [(record[0], record[1], record[2]) for record in self._tree_records.values()]
+
+    def graph(self):
+        return {'vertices': list(self.vertex_ids),
+                'edges': [(record[0], record[1], record[2]) for record in self._edges.values()]}
+
+
+# Randomized check and benchmark against recomputation
+
+
+def forest_weight(graph):
+    return sum(w for _, _, w in kruskal_arrays(graph))
+
+
+def self_check(trials=30, n=40, operations=300, seed=0):
+    # Random insertions, removals and weight changes; after every step the
+    # maintained forest must be a spanning forest of the current graph with
+    # the same weight as recomputing kruskal from scratch. Parallel edges
+    # (in the initial multigraph and from add_edge) keep the lightest weight.
+    from mst import UnionFind
+    rng = random.Random(seed)
+    for trial in range(trials):
+        graph = {'vertices': list(range(n)), 'edges': []}
+        pairs = {}
+        for _ in range(n):
+            u, v = rng.randrange(n), rng.randrange(n)
+            w = rng.randint(1, 20)
+            graph['edges'].append((u, v, w))
+            if rng.random() < 0.3:
+                graph['edges'].append((v, u, rng.randint(1, 20)))
+        for u, v, w in graph['edges']:
+            key = frozenset((u, v))
+            if key not in pairs or w < pairs[key][2]:
+                pairs[key] = (u, v, w)
+        dynamic = DynamicMST(graph)
+        if dynamic.total_weight != forest_weight(graph):
+            raise AssertionError(f"trial {trial}: initial forest differs from kruskal on the multigraph")
+        for step in range(operations):
+            op = rng.random()
+            if op < 0.4 or not pairs:
+                u, v = rng.randrange(n), rng.randrange(n)
+                w = rng.randint(1, 20)
+                dynamic.add_edge(u, v, w)
+                key = frozenset((u, v))
+                if key not in pairs or w < pairs[key][2]:
+                    pairs[key] = (pairs[key][0], pairs[key][1], w) if key in pairs else (u, v, w)
+            elif op < 0.7:
+                u, v, _ = pairs.pop(rng.choice(list(pairs)))
+                dynamic.remove_edge(u, v)
+            else:
+                key = rng.choice(list(pairs))
+                u, v, _ = pairs[key]
+                w = rng.randint(1, 20)
+                dynamic.update_weight(u, v, w)
+                pairs[key] = (u, v, w)
+            current = {'vertices': list(range(n)), 'edges': list(pairs.values())}
+            weights = {frozenset((u, v)): w for u, v, w in dynamic.graph()['edges']}
+            if weights != {key: w for key, (_, _, w) in pairs.items()}:
+                raise AssertionError(f"trial {trial} step {step}: edge weights differ")
+            tree = dynamic.edges()
+            uf = UnionFind(n)
+            if not all(uf.union(u, v) for u, v, _ in tree):
+                raise AssertionError(f"trial {trial} step {step}: forest has a cycle")
+            expected = kruskal_arrays(current)
+            if len(tree) != len(expected) or dynamic.total_weight != sum(w for _, _, w in expected):
+                raise AssertionError(f"trial {trial} step {step}: forest differs from kruskal")
+    return trials * operations
+
+
+def benchmark(n=20000, m=100000, updates=2000, seed=0):
+    from algorithms import kruskal
+    from mst import random_edge_graph
+    rng = random.Random(seed)
+    graph = random_edge_graph(n, m, seed)
+    pairs = {}
+    for u, v, w in graph['edges']:
+        if u != v and frozenset((u, v)) not in pairs:
+            pairs[frozenset((u, v))] = (u, v, w)
+    graph['edges'] = list(pairs.values())
+    t0 = time.perf_counter()
+    dynamic = DynamicMST(graph, kruskal(graph))
+    build = time.perf_counter() - t0
+    t0 = time.perf_counter()
+    for _ in range(updates):
+        key = rng.choice(graph['edges'])
+        dynamic.update_weight(key[0], key[1], rng.randint(1, 1000))
+    per_update = (time.perf_counter() - t0) / updates
+    t0 = time.perf_counter()
+    total = sum(w for _, _, w in kruskal(dynamic.graph()))
+    recompute = time.perf_counter() - t0
+    if total != dynamic.total_weight:
+        raise AssertionError("dynamic forest differs from kruskal")
+    return build, per_update, recompute
+
+
+if __name__ == "__main__":
+    graph_kruskal = {
+        'vertices': ['A', 'B', 'C', 'D'],
+        'edges': [
+            ('A', 'B', 1),
+            ('A', 'C', 4),
+            ('B', 'C', 2),
+            ('B', 'D', 5),
+            ('C', 'D', 1)
+        ]
+    }
+    dynamic = DynamicMST(graph_kruskal)
+    print("Dynamic MST:", dynamic.edges())
+    dynamic.update_weight('B', 'C', 6)
+    print("After B-C -> 6:", dynamic.edges())
+    dynamic.remove_edge('C', 'D')
+    print("After removing C-D:", dynamic.edges())
+
+    print("Randomized check:", self_check(), "operations match kruskal")
+    build, per_update, recompute = benchmark()
+    print(f"Build: {build:.3f}s  Update: {per_update * 1e6:.1f}us  Kruskal recompute: {recompute:.3f}s")
@@ -0,0 +1,158 @@
+import heapq
+import mmap
+import os
+import struct
+import sys
+import tempfile
+
+from sorting import adaptive_sort
+
+# External-memory merge sort
+#
+# Records (str or bytes) are collected into chunks that fit memory_budget,
+# each chunk is sorted with adaptive_sort and spilled to a binary run file,
+# then the runs are combined by a k-way heap merge. Run files are read
+# through mmap one record at a time, and pages already consumed are dropped
+# with madvise, so peak memory is about memory_budget + fan_in * buffer_size
+# regardless of input size. Equal records keep their input order.
+#
+# Run file format: repeated <uint32 little-endian length><payload>.
+
+DEFAULT_MEMORY_BUDGET = 64 * 1024 * 1024
+DEFAULT_FAN_IN = 64
+DEFAULT_BUFFER_SIZE = 1024 * 1024
+_LENGTH = struct.Struct('<I')
+# Rough per-record cost of the chunk list and the (key, index) decoration
+_RECORD_OVERHEAD = 64
+
+
+def external_sort(records, memory_budget=DEFAULT_MEMORY_BUDGET, key=None,
+                  fan_in=DEFAULT_FAN_IN, buffer_size=DEFAULT_BUFFER_SIZE, tmp_dir=None):
+    if fan_in < 2:
+        raise ValueError("fan_in must be at least 2")
+    with tempfile.TemporaryDirectory(prefix='extsort-', dir=tmp_dir) as work_dir:
+        runs, is_text = _spill_runs(records, memory_budget, key, work_dir)
+        level = 0
+        while len(runs) > fan_in:
+            merged = []
+            for i in range(0, len(runs), fan_in):
+                group = runs[i:i + fan_in]
+                path = os.path.join(work_dir, f'merge-{level}-{i // fan_in}.run')
+                with open(path, 'wb', buffering=buffer_size) as out:
+                    for record in _merge_runs(group, key, is_text, buffer_size):
+                        _write_record(out, record, is_text)
+                for old in group:
+                    os.remove(old)
+                merged.append(path)
+            runs = merged
+            level += 1
+        yield from _merge_runs(runs, key, is_text, buffer_size)
+
+
+def external_sort_file(input_path, output_path, memory_budget=DEFAULT_MEMORY_BUDGET,
+                       key=None, fan_in=DEFAULT_FAN_IN, buffer_size=DEFAULT_BUFFER_SIZE,
+                       tmp_dir=None):
+    # Sorts the lines of a file; line endings are stripped before sorting so
+    # the last line sorts the same whether or not it ends with a newline
+    with open(input_path, 'rb', buffering=buffer_size) as src:
+        lines = (line.rstrip(b'\n') for line in src)
+        with open(output_path, 'wb', buffering=buffer_size) as out:
+            count = 0
+            for line in external_sort(lines, memory_budget, key, fan_in, buffer_size, tmp_dir):
+                out.write(line)
+                out.write(b'\n')
+                count += 1
+    return count
+
+
+def _spill_runs(records, memory_budget, key, work_dir):
+    runs = []
+    chunk = []
+    used = 0
+    is_text = None
+    for record in records:
+        if is_text is None:
+            is_text = isinstance(record, str)
+        chunk.append(record)
+        used += sys.getsizeof(record) + _RECORD_OVERHEAD
+        if used >= memory_budget:
+            runs.append(_write_run(chunk, key, is_text, work_dir, len(runs)))
+            chunk = []
+            used = 0
+    if chunk:
+        runs.append(_write_run(chunk, key, is_text, work_dir, len(runs)))
+    return runs, is_text
+
+
+def _write_run(chunk, key, is_text, work_dir, index):
+    adaptive_sort(chunk, key=key)
+    path = os.path.join(work_dir, f'run-{index}.run')
+    with open(path, 'wb', buffering=DEFAULT_BUFFER_SIZE) as out:
+        for record in chunk:
+            _write_record(out, record, is_text)
+    return path
+
+
+def _write_record(out, record, is_text):
+    payload = record.encode('utf-8') if is_text else record
+    out.write(_LENGTH.pack(len(payload)))
+    out.write(payload)
+
+
+def _read_run(path, is_text, buffer_size):
+    with open(path, 'rb') as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            if hasattr(mm, 'madvise'):
+                mm.madvise(mmap.MADV_SEQUENTIAL)
+            can_drop = hasattr(mm, 'madvise') and hasattr(mmap, 'MADV_DONTNEED')
+            size = len(mm)
+            pos = 0
+            released = 0
+            while pos < size:
+                (length,) = _LENGTH.unpack_from(mm, pos)
+                pos += _LENGTH.size
+                payload = mm[pos:pos + length]
+                pos += length
+                yield payload.decode('utf-8') if is_text else payload
+                # Hand pages we have moved past back to the OS
+                if can_drop and pos - released >= buffer_size:
+                    end = pos - pos % mmap.PAGESIZE
+                    if end > released:
+                        mm.madvise(mmap.MADV_DONTNEED, released, end - released)
+                        released = end
+
+
+def _merge_runs(paths, key, is_text, buffer_size):
+    readers = [_read_run(path, is_text, buffer_size) for path in paths]
+    heap = []
+    # The run index breaks ties, so equal keys come out in run (input) order
+    for index, reader in enumerate(readers):
+        for record in reader:
+            heap.append((record if key is None else key(record), index, record))
+            break
+    heapq.heapify(heap)
+    while heap:
+        _, index, record = heap[0]
+        yield record
+        for nxt in readers[index]:
+            heapq.heapreplace(heap, (nxt if key is None else key(nxt), index, nxt))
+            break
+        else:
+            heapq.heappop(heap)
+
+
+if __name__ == "__main__":
+    import random
+    import time
+
+    rng = random.Random(0)
+    n = 200000
+    data = [f'{rng.random():.12f},{rng.randrange(1000)}' for _ in range(n)]
+    t0 = time.perf_counter()
+    # A tiny budget forces many runs and a multi-pass merge
+    out = list(external_sort(iter(data), memory_budget=256 * 1024, fan_in=8))
+    elapsed = time.perf_counter() - t0
+    print("External Sort matches sorted():", out == sorted(data))
+    print(f"External Sort: {n} records in {elapsed:.3f}s")
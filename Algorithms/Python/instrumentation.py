@@ -0,0 +1,421 @@
+import json
+import time
+from contextlib import contextmanager
+from functools import partial
+
+import algorithms
+from algorithms import pq_extract_min, pq_insert, pq_is_empty
+
+# Opt-in operation counts and phase timings
+#
+# The routines in algorithms.py are left untouched, so there is no cost when
+# instrumentation is off. Each function below is an instrumented copy that
+# returns exactly what the original returns and records into a Profile:
+#   comparisons, swaps, moves          - sorts
+#   heap_pushes, heap_pops             - priority queue traffic
+#   relaxations, decreases             - edges examined / distances improved
+#   finds, unions                      - kruskal's union-find
+# plus the wall time of each phase (e.g. heap_sort's build_heap/extract).
+# Counters live in local variables inside the loops and are added to the
+# profile once per call.
+#
+# instrument() swaps the variants into the algorithms module for the
+# duration of a with-block, so code calling algorithms.heap_sort(...) gets
+# counted without changes. Names bound earlier with `from algorithms import`
+# keep the originals, and the swap is process-wide, not per thread. Calling a
+# variant directly without a profile records into default_profile.
+
+
+class Profile:
+    def __init__(self):
+        self.algorithms = {}
+
+    def _entry(self, algorithm):
+        entry = self.algorithms.get(algorithm)
+        if entry is None:
+            entry = self.algorithms[algorithm] = {'calls': 0, 'counts': {}, 'phases': {}}
+        return entry
+
+    def call(self, algorithm):
+        self._entry(algorithm)['calls'] += 1
+
+    def add(self, algorithm, **counts):
+        totals = self._entry(algorithm)['counts']
+        for name, value in counts.items():
+            totals[name] = totals.get(name, 0) + value
+
+    @contextmanager
+    def phase(self, algorithm, name):
+        phases = self._entry(algorithm)['phases']
+        t0 = time.perf_counter()
+        try:
+            yield
+        finally:
+            phases[name] = phases.get(name, 0.0) + time.perf_counter() - t0
+
+    def counts(self, algorithm):
+        return dict(self._entry(algorithm)['counts'])
+
+    def reset(self):
+        self.algorithms.clear()
+
+    def to_dict(self):
+        return {algorithm: {'calls': entry['calls'],
+                            'counts': dict(entry['counts']),
+                            'phases': dict(entry['phases'])}
+                for algorithm, entry in self.algorithms.items()}
+
+    def to_json(self, **kwargs):
+        return json.dumps(self.to_dict(), **kwargs)
+
+
+default_profile = Profile()
+
+
+# Sorting Algorithms
+
+
+def bubble_sort(arr, profile=None):
+    profile = profile or default_profile
+    profile.call('bubble_sort')
+    comparisons = swaps = 0
+    n = len(arr)
+    for i in range(n):
+        for j in range(0, n-i-1):
+            comparisons += 1
+            if arr[j] > arr[j+1]:
+                arr[j], arr[j+1] = arr[j+1], arr[j]
+                swaps += 1
+    profile.add('bubble_sort', comparisons=comparisons, swaps=swaps)
+    return arr
+
+
+def quick_sort(arr, profile=None):
+    profile = profile or default_profile
+    profile.call('quick_sort')
+    counts = [0, 0]
+    with profile.phase('quick_sort', 'partition'):
+        result = _quick_sort(arr, counts)
+    profile.add('quick_sort', comparisons=counts[0], moves=counts[1])
+    return result
+
+
+def _quick_sort(arr, counts):
+    if len(arr) <= 1:
+        return arr
+    pivot = arr[len(arr)//2]
+    left = [x for x in arr if x < pivot]
+    middle = [x for x in arr if x == pivot]
+    right = [x for x in arr if x > pivot]
+    # Three comprehension passes compare every element with the pivot, and
+    # every element is copied into exactly one partition
+    counts[0] += 3 * len(arr)
+    counts[1] += len(arr)
+    return _quick_sort(left, counts) + middle + _quick_sort(right, counts)
+
+
+def merge_sort(arr, profile=None):
+    profile = profile or default_profile
+    profile.call('merge_sort')
+    counts = [0, 0]
+    _merge_sort(arr, counts)
+    profile.add('merge_sort', comparisons=counts[0], moves=counts[1])
+    return arr
+
+
+def _merge_sort(arr, counts):
+    if len(arr) > 1:
+        mid = len(arr)//2
+        L = arr[:mid]
+        R = arr[mid:]
+        _merge_sort(L, counts)
+        _merge_sort(R, counts)
+        i = j = k = 0
+        comparisons = 0
+        while i < len(L) and j < len(R):
+            comparisons += 1
+            if L[i] < R[j]:
+                arr[k] = L[i]
+                i += 1
+            else:
+                arr[k] = R[j]
+                j += 1
+            k += 1
+        while i < len(L):
+            arr[k] = L[i]
+            i += 1
+            k += 1
+        while j < len(R):
+            arr[k] = R[j]
+            j += 1
+            k += 1
+        counts[0] += comparisons
+        counts[1] += len(arr)
+    return arr
+
+
+def insertion_sort(arr, profile=None):
+    profile = profile or default_profile
+    profile.call('insertion_sort')
+    comparisons = moves = 0
+    for i in range(1, len(arr)):
+        key = arr[i]
+        j = i-1
+        while j >= 0:
+            comparisons += 1
+            if not key < arr[j]:
+                break
+            arr[j + 1] = arr[j]
+            moves += 1
+            j -= 1
+        arr[j + 1] = key
+        moves += 1
+    profile.add('insertion_sort', comparisons=comparisons, moves=moves)
+    return arr
+
+
+def selection_sort(arr, profile=None):
+    profile = profile or default_profile
+    profile.call('selection_sort')
+    comparisons = swaps = 0
+    for i in range(len(arr)):
+        min_idx = i
+        for j in range(i+1, len(arr)):
+            comparisons += 1
+            if arr[j] < arr[min_idx]:
+                min_idx = j
+        arr[i], arr[min_idx] = arr[min_idx], arr[i]
+        swaps += 1
+    profile.add('selection_sort', comparisons=comparisons, swaps=swaps)
+    return arr
+
+
+def _sift_down(arr, n, i):
+    # Same comparisons and swaps as algorithms.heapify, returned as counts
+    comparisons = swaps = 0
+    while True:
+        largest = i
+        l = 2*i + 1
+        r = 2*i + 2
+        if l < n:
+            comparisons += 1
+            if arr[l] > arr[largest]:
+                largest = l
+        if r < n:
+            comparisons += 1
+            if arr[r] > arr[largest]:
+                largest = r
+        if largest == i:
+            return comparisons, swaps
+        arr[i], arr[largest] = arr[largest], arr[i]
+        swaps += 1
+        i = largest
+
+
+def heap_sort(arr, profile=None):
+    profile = profile or default_profile
+    profile.call('heap_sort')
+    comparisons = swaps = 0
+    n = len(arr)
+    with profile.phase('heap_sort', 'build_heap'):
+        for i in range(n//2 - 1, -1, -1):
+            c, s = _sift_down(arr, n, i)
+            comparisons += c
+            swaps += s
+    with profile.phase('heap_sort', 'extract'):
+        for i in range(n-1, 0, -1):
+            arr[i], arr[0] = arr[0], arr[i]
+            c, s = _sift_down(arr, i, 0)
+            comparisons += c
+            swaps += s + 1
+    profile.add('heap_sort', comparisons=comparisons, swaps=swaps,
+                heap_pops=max(0, n - 1))
+    return arr
+
+
+# Graph Algorithms
+
+
+def dijkstra(graph, start, pq_class=None, profile=None):
+    profile = profile or default_profile
+    profile.call('dijkstra')
+    pushes = pops = relaxations = decreases = 0
+    with profile.phase('dijkstra', 'init'):
+        distances = {node: float('inf') for node in graph}
+        distances[start] = 0
+    with profile.phase('dijkstra', 'search'):
+        if pq_class is None:
+            pq = []
+            pq_insert(pq, (0, start))
+            pushes += 1
+            visited = set()
+            while not pq_is_empty(pq):
+                current_distance, current_node = pq_extract_min(pq)
+                pops += 1
+                if current_node in visited:
+                    continue
+                visited.add(current_node)
+                for neighbor in graph[current_node]:
+                    distance = current_distance + graph[current_node][neighbor]
+                    relaxations += 1
+                    if distance < distances[neighbor]:
+                        distances[neighbor] = distance
+                        pq_insert(pq, (distance, neighbor))
+                        pushes += 1
+                        decreases += 1
+        else:
+            pq = pq_class()
+            pq.insert(start, 0)
+            pushes += 1
+            while not pq.is_empty():
+                current_distance, current_node = pq.extract_min()
+                pops += 1
+                for neighbor, weight in graph[current_node].items():
+                    distance = current_distance + weight
+                    relaxations += 1
+                    if distance < distances[neighbor]:
+                        distances[neighbor] = distance
+                        pq.push_or_decrease(neighbor, distance)
+                        pushes += 1
+                        decreases += 1
+    profile.add('dijkstra', heap_pushes=pushes, heap_pops=pops,
+                relaxations=relaxations, decreases=decreases)
+    return distances
+
+
+def kruskal(graph, profile=None):
+    profile = profile or default_profile
+    profile.call('kruskal')
+    parent = {}
+    rank = {}
+    counts = [0, 0]
+
+    def find(node):
+        counts[0] += 1
+        while parent[node] != node:
+            parent[node] = parent[parent[node]]
+            node = parent[node]
+        return node
+
+    def union(u, v):
+        root1 = find(u)
+        root2 = find(v)
+        if root1 != root2:
+            counts[1] += 1
+            if rank[root1] > rank[root2]:
+                parent[root2] = root1
+            else:
+                parent[root1] = root2
+                if rank[root1] == rank[root2]:
+                    rank[root2] += 1
+    for node in graph['vertices']:
+        parent[node] = node
+        rank[node] = 0
+    mst = []
+    with profile.phase('kruskal', 'sort_edges'):
+        edges = sorted(graph['edges'], key=lambda x: x[2])
+    with profile.phase('kruskal', 'union_find'):
+        for edge in edges:
+            u, v, weight = edge
+            if find(u) != find(v):
+                union(u, v)
+                mst.append(edge)
+    profile.add('kruskal', finds=counts[0], unions=counts[1])
+    return mst
+
+
+def prim(graph, start, pq_class=None, profile=None):
+    profile = profile or default_profile
+    profile.call('prim')
+    pushes = pops = relaxations = 0
+    mst = []
+    visited = set([start])
+    with profile.phase('prim', 'search'):
+        if pq_class is None:
+            nodes = list(graph.keys())
+            pq = []
+            for v, w in graph[start].items():
+                pq_insert(pq, (w, start, v))
+                pushes += 1
+            while len(visited) < len(nodes):
+                if pq_is_empty(pq):
+                    break
+                w, u, v = pq_extract_min(pq)
+                pops += 1
+                if v not in visited:
+                    visited.add(v)
+                    mst.append((u, v, w))
+                    for to_next, weight in graph[v].items():
+                        relaxations += 1
+                        if to_next not in visited:
+                            pq_insert(pq, (weight, v, to_next))
+                            pushes += 1
+        else:
+            pq = pq_class()
+            for v, w in graph[start].items():
+                if v not in visited:
+                    pq.push_or_decrease(v, (w, start, v))
+                    pushes += 1
+            while not pq.is_empty():
+                (w, u, v), _ = pq.extract_min()
+                pops += 1
+                visited.add(v)
+                mst.append((u, v, w))
+                for to_next, weight in graph[v].items():
+                    relaxations += 1
+                    if to_next not in visited:
+                        pq.push_or_decrease(to_next, (weight, v, to_next))
+                        pushes += 1
+    profile.add('prim', heap_pushes=pushes, heap_pops=pops, relaxations=relaxations)
+    return mst
+
+
+VARIANTS = {
+    'bubble_sort': bubble_sort,
+    'quick_sort': quick_sort,
+    'merge_sort': merge_sort,
+    'insertion_sort': insertion_sort,
+    'selection_sort': selection_sort,
+    'heap_sort': heap_sort,
+    'dijkstra': dijkstra,
+    'kruskal': kruskal,
+    'prim': prim,
+}
+
+
+@contextmanager
+def instrument(profile=None, names=None):
+    # with instrument() as profile: algorithms.heap_sort(data)
+    profile = profile or Profile()
+    saved = {}
+    try:
+        for name in names or VARIANTS:
+            saved[name] = getattr(algorithms, name)
+            setattr(algorithms, name, partial(VARIANTS[name], profile=profile))
+        yield profile
+    finally:
+        for name, func in saved.items():
+            setattr(algorithms, name, func)
+
+
+if __name__ == "__main__":
+    import random
+    from priority_queues import BinaryHeap, random_graph
+
+    rng = random.Random(0)
+    data = [rng.random() for _ in range(20000)]
+    graph = random_graph(2000, 8)
+    edges = {'vertices': list(graph),
+             'edges': [(u, v, w) for u, adjacent in graph.items() for v, w in adjacent.items() if u < v]}
+
+    with instrument() as profile:
+        for name in ('heap_sort', 'merge_sort', 'quick_sort'):
+            assert getattr(algorithms, name)(data.copy()) == sorted(data)
+        algorithms.insertion_sort(data[:2000])
+        algorithms.dijkstra(graph, 0)
+        algorithms.dijkstra(graph, 0, pq_class=BinaryHeap)
+        algorithms.prim(graph, 0)
+        algorithms.kruskal(edges)
+    # The originals are back once the block exits
+    assert all(getattr(algorithms, name).__module__ == 'algorithms' for name in VARIANTS)
+    print(profile.to_json(indent=2))
@@ -0,0 +1,202 @@
+import random
+import time
+
+from algorithms import fractional_knapsack
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# Fractional knapsack at scale
+#
+# fractional_knapsack_batch solves many instances in one pass of array
+# operations. Instances come either as 2-D (m, n) weights/values padded on
+# the right (lengths[i] gives the real item count of row i, default n) or as
+# flat ragged arrays where instance i owns items offsets[i]:offsets[i+1].
+# Items are ordered by value/weight ratio inside each instance (a stable
+# sort, same order as fractional_knapsack), and with cw the cumulative weight
+# before an item the fraction taken is clip((capacity - cw) / weight, 0, 1):
+# 1 for items that fit, the partial fraction for the one that does not, 0
+# after it. Returns one total value per instance.
+#
+# fractional_knapsack_linear solves one instance without sorting: only the
+# critical ratio (the weighted median of the ratios at the capacity) matters.
+# Quickselect-style rounds partition the items around a pivot ratio, take
+# everything above it when it fits and discard the other side, so the
+# expected work is O(n).
+
+
+def fractional_knapsack_batch(weights, values, capacities, offsets=None, lengths=None):
+    if np is None:
+        raise ImportError("fractional_knapsack_batch requires NumPy")
+    weights = np.asarray(weights, dtype=np.float64)
+    values = np.asarray(values, dtype=np.float64)
+    capacities = np.asarray(capacities, dtype=np.float64)
+    if offsets is not None:
+        return _batch_ragged(weights, values, capacities, np.asarray(offsets, dtype=np.int64))
+    if weights.ndim != 2 or weights.shape != values.shape:
+        raise ValueError("padded instances must be matching 2-D arrays")
+    m, n = weights.shape
+    valid = None
+    if lengths is not None:
+        valid = np.arange(n) < np.asarray(lengths)[:, None]
+        # Padding gets weight 1 and value 0 and sorts after every real item,
+        # so it never changes the cumulative weights and adds no value
+        weights = np.where(valid, weights, 1.0)
+        values = np.where(valid, values, 0.0)
+    if np.any(weights <= 0):
+        raise ValueError("item weights must be positive")
+    ratio = values / weights
+    if valid is not None:
+        ratio[~valid] = -np.inf
+    order = np.argsort(-ratio, axis=1, kind='stable')
+    w = np.take_along_axis(weights, order, axis=1)
+    v = np.take_along_axis(values, order, axis=1)
+    before = np.cumsum(w, axis=1) - w
+    taken = np.clip((capacities[:, None] - before) / w, 0.0, 1.0)
+    return (taken * v).sum(axis=1)
+
+
+def _batch_ragged(weights, values, capacities, offsets):
+    counts = np.diff(offsets)
+    m = len(counts)
+    if len(capacities) != m or len(offsets) == 0 or offsets[-1] != len(weights):
+        raise ValueError("offsets do not match the item and capacity arrays")
+    if np.any(weights <= 0):
+        raise ValueError("item weights must be positive")
+    instance = np.repeat(np.arange(m), counts)
+    width = int(counts.max()) if m else 0
+    if m * width <= 2 * len(weights):
+        # Instances of similar size: scatter them into padded rows, where a
+        # per-row argsort is much cheaper than one lexsort over every item
+        position = np.arange(len(weights)) - np.repeat(offsets[:-1], counts)
+        padded_w = np.ones((m, width))
+        padded_v = np.zeros((m, width))
+        padded_w[instance, position] = weights
+        padded_v[instance, position] = values
+        return fractional_knapsack_batch(padded_w, padded_v, capacities, lengths=counts)
+    # lexsort sorts by the last key first: instance, then descending ratio,
+    # ties keeping input order
+    order = np.lexsort((-(values / weights), instance))
+    w = weights[order]
+    v = values[order]
+    total = np.cumsum(w)
+    start = np.concatenate(([0.0], total))[offsets[:-1]]
+    before = total - w - np.repeat(start, counts)
+    taken = np.clip((np.repeat(capacities, counts) - before) / w, 0.0, 1.0)
+    return np.bincount(instance, weights=taken * v, minlength=m)
+
+
+def fractional_knapsack_linear(weights, values, capacity, seed=0):
+    if np is not None and len(weights) >= 1024:
+        return _linear_numpy(np.asarray(weights, dtype=np.float64),
+                             np.asarray(values, dtype=np.float64), capacity, seed)
+    return _linear_python(list(weights), list(values), capacity, seed)
+
+
+def _linear_python(weights, values, capacity, seed):
+    rng = random.Random(seed)
+    items = [(v / w, w, v) for w, v in zip(weights, values)]
+    total = 0
+    while items and capacity > 0:
+        pivot = rng.choice(items)[0]
+        above = [item for item in items if item[0] > pivot]
+        weight_above = sum(item[1] for item in above)
+        if weight_above > capacity:
+            # The critical ratio is above the pivot
+            items = above
+            continue
+        total += sum(item[2] for item in above)
+        capacity -= weight_above
+        weight_equal = sum(item[1] for item in items if item[0] == pivot)
+        if weight_equal >= capacity:
+            return total + pivot * capacity
+        total += sum(item[2] for item in items if item[0] == pivot)
+        capacity -= weight_equal
+        items = [item for item in items if item[0] < pivot]
+    return total
+
+
+def _linear_numpy(weights, values, capacity, seed):
+    rng = random.Random(seed)
+    ratio = values / weights
+    total = 0.0
+    while len(ratio) and capacity > 0:
+        pivot = ratio[rng.randrange(len(ratio))]
+        above = ratio > pivot
+        weight_above = weights[above].sum()
+        if weight_above > capacity:
+            ratio, weights, values = ratio[above], weights[above], values[above]
+            continue
+        total += values[above].sum()
+        capacity -= weight_above
+        equal = ratio == pivot
+        weight_equal = weights[equal].sum()
+        if weight_equal >= capacity:
+            return float(total + pivot * capacity)
+        total += values[equal].sum()
+        capacity -= weight_equal
+        below = ratio < pivot
+        ratio, weights, values = ratio[below], weights[below], values[below]
+    return float(total)
+
+
+# Benchmark: throughput against looping over fractional_knapsack
+
+
+def random_instances(m, n, seed=0):
+    rng = random.Random(seed)
+    weights = [[rng.randint(1, 100) for _ in range(n)] for _ in range(m)]
+    values = [[rng.randint(1, 100) for _ in range(n)] for _ in range(m)]
+    capacities = [sum(row) // 2 for row in weights]
+    return weights, values, capacities
+
+
+def benchmark(m=100000, n=10, large=1000000, seed=0):
+    weights, values, capacities = random_instances(m, n, seed)
+    results = []
+    t0 = time.perf_counter()
+    expected = [fractional_knapsack(w, v, c) for w, v, c in zip(weights, values, capacities)]
+    results.append(('fractional_knapsack loop', m, time.perf_counter() - t0))
+    if np is not None:
+        w2, v2 = np.array(weights), np.array(values)
+        t0 = time.perf_counter()
+        padded = fractional_knapsack_batch(w2, v2, capacities)
+        results.append(('batch (padded)', m, time.perf_counter() - t0))
+        offsets = np.arange(0, m * n + 1, n)
+        t0 = time.perf_counter()
+        ragged = fractional_knapsack_batch(w2.ravel(), v2.ravel(), capacities, offsets=offsets)
+        results.append(('batch (ragged)', m, time.perf_counter() - t0))
+        if not (np.allclose(padded, expected) and np.allclose(ragged, expected)):
+            raise AssertionError("batch solver disagrees with fractional_knapsack")
+
+    [weights], [values], [capacity] = random_instances(1, large, seed)
+    t0 = time.perf_counter()
+    expected = fractional_knapsack(weights, values, capacity)
+    results.append(('fractional_knapsack (1 large)', 1, time.perf_counter() - t0))
+    solvers = [('linear (python)', lambda: _linear_python(weights, values, capacity, seed))]
+    if np is not None:
+        w1, v1 = np.asarray(weights, dtype=np.float64), np.asarray(values, dtype=np.float64)
+        solvers.append(('linear (numpy)', lambda: _linear_numpy(w1, v1, capacity, seed)))
+    for name, solve in solvers:
+        t0 = time.perf_counter()
+        result = solve()
+        results.append((name + ' (1 large)', 1, time.perf_counter() - t0))
+        if abs(result - expected) > 1e-6 * max(1, abs(expected)):
+            raise AssertionError(f"{name} disagrees with fractional_knapsack")
+    return results
+
+
+if __name__ == "__main__":
+    weights = [10, 20, 30]
+    values = [60, 100, 120]
+    capacity = 50
+    print("Fractional Knapsack (linear):", fractional_knapsack_linear(weights, values, capacity))
+    if np is not None:
+        print("Fractional Knapsack (batch):", fractional_knapsack_batch([weights, [5, 0, 0]], [values, [10, 0, 0]],
+                                                                        [50, 4], lengths=[3, 1]))
+
+    print(f"{'solver':<32}{'instances/s':>14}{'seconds':>10}")
+    for name, count, seconds in benchmark():
+        print(f"{name:<32}{count / seconds:>14,.0f}{seconds:>10.4f}")
@@ -0,0 +1,228 @@
+import time
+from array import array
+from concurrent.futures import ThreadPoolExecutor
+from operator import itemgetter
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# Array-backed MST engine
+#
+# Vertex labels are mapped to dense int ids once; after that union-find and
+# edge ordering only touch flat int32/float64 arrays. Both entry points take
+# either graph format used in algorithms.py (kruskal's {'vertices', 'edges'}
+# or prim's dict of dicts) and return the MST as a list of (u, v, w) tuples
+# like kruskal and prim do.
+
+
+class UnionFind:
+    def __init__(self, n):
+        self.parent = array('i', range(n))
+        self.size = array('i', [1]) * n
+
+    def find(self, x):
+        parent = self.parent
+        # Path halving: every other node on the path skips to its grandparent
+        while parent[x] != x:
+            parent[x] = parent[parent[x]]
+            x = parent[x]
+        return x
+
+    def union(self, a, b):
+        a = self.find(a)
+        b = self.find(b)
+        if a == b:
+            return False
+        if self.size[a] < self.size[b]:
+            a, b = b, a
+        self.parent[b] = a
+        self.size[a] += self.size[b]
+        return True
+
+
+def index_graph(graph):
+    # Returns (edges, src, dst, weights, n): edges are the original tuples,
+    # src/dst the dense ids of their endpoints
+    if 'vertices' in graph and 'edges' in graph:
+        labels = list(graph['vertices'])
+        edges = list(graph['edges'])
+    else:
+        labels = list(graph)
+        edges = []
+        seen = set()
+        for u, adjacent in graph.items():
+            for v, w in adjacent.items():
+                if (v, u) not in seen:
+                    seen.add((u, v))
+                    edges.append((u, v, w))
+    weights = array('d', map(itemgetter(2), edges))
+    if labels == list(range(len(labels))):
+        # Already dense integer ids: no label mapping needed
+        try:
+            src = array('i', map(itemgetter(0), edges))
+            dst = array('i', map(itemgetter(1), edges))
+            if not src or max(max(src), max(dst)) < len(labels) and min(min(src), min(dst)) >= 0:
+                return edges, src, dst, weights, len(labels)
+        except (TypeError, OverflowError):
+            pass
+    ids = {label: i for i, label in enumerate(labels)}
+    try:
+        src = array('i', map(ids.__getitem__, map(itemgetter(0), edges)))
+        dst = array('i', map(ids.__getitem__, map(itemgetter(1), edges)))
+    except KeyError:
+        # Endpoints missing from the vertex list get ids after the listed ones
+        for u, v, _ in edges:
+            for label in (u, v):
+                if label not in ids:
+                    ids[label] = len(ids)
+        src = array('i', map(ids.__getitem__, map(itemgetter(0), edges)))
+        dst = array('i', map(ids.__getitem__, map(itemgetter(1), edges)))
+    return edges, src, dst, weights, len(ids)
+
+
+def _edge_order(weights):
+    # Stable, so equal weights keep input order exactly like kruskal's sorted()
+    if np is not None:
+        return np.argsort(np.frombuffer(weights, dtype=np.float64), kind='stable').tolist()
+    return sorted(range(len(weights)), key=weights.__getitem__)
+
+
+def kruskal_arrays(graph):
+    edges, src, dst, weights, n = index_graph(graph)
+    uf = UnionFind(n)
+    mst = []
+    for k in _edge_order(weights):
+        if uf.union(src[k], dst[k]):
+            mst.append(edges[k])
+            if len(mst) == n - 1:
+                break
+    return mst
+
+
+def boruvka(graph, workers=1, chunk_size=1 << 20):
+    # Each round every component picks its cheapest outgoing edge (ties
+    # broken by position in the stable weight order, so no cycles can form)
+    # and all picked edges are contracted at once. There are O(log V) rounds.
+    edges, src, dst, weights, n = index_graph(graph)
+    m = len(edges)
+    if m == 0:
+        return []
+    order = _edge_order(weights)
+    rank = array('i', bytes(4 * m))
+    for position, k in enumerate(order):
+        rank[k] = position
+    uf = UnionFind(n)
+    mst = []
+    if np is not None:
+        src = np.frombuffer(src, dtype=np.int32)
+        dst = np.frombuffer(dst, dtype=np.int32)
+        rank = np.frombuffer(rank, dtype=np.int32)
+    while len(mst) < n - 1:
+        comp = _components(uf, n)
+        best = _cheapest_edges(comp, src, dst, rank, n, m, workers, chunk_size)
+        added = False
+        for position in best:
+            k = order[position]
+            if uf.union(src[k], dst[k]):
+                mst.append(edges[k])
+                added = True
+        if not added:
+            break
+    return mst
+
+
+def _components(uf, n):
+    comp = array('i', [uf.find(v) for v in range(n)])
+    return np.frombuffer(comp, dtype=np.int32) if np is not None else comp
+
+
+def _cheapest_edges(comp, src, dst, rank, n, m, workers, chunk_size):
+    # Returns the distinct rank positions of the cheapest edge leaving each
+    # component. Chunks of the edge list are independent, so with workers > 1
+    # they are reduced in a thread pool (NumPy releases the GIL while it
+    # gathers) and the per-chunk minima are combined at the end.
+    bounds = [(lo, min(lo + chunk_size, m)) for lo in range(0, m, chunk_size)]
+    if np is None:
+        best = _chunk_minima_python(comp, src, dst, rank, n, m, 0, m)
+        return sorted({b for b in best if b < m})
+    if workers > 1 and len(bounds) > 1:
+        with ThreadPoolExecutor(workers) as pool:
+            partial = list(pool.map(lambda b: _chunk_minima(comp, src, dst, rank, n, m, *b), bounds))
+    else:
+        partial = [_chunk_minima(comp, src, dst, rank, n, m, lo, hi) for lo, hi in bounds]
+    best = partial[0]
+    for other in partial[1:]:
+        np.minimum(best, other, out=best)
+    return np.unique(best[best < m]).tolist()
+
+
+def _chunk_minima(comp, src, dst, rank, n, m, lo, hi):
+    cu = comp[src[lo:hi]]
+    cv = comp[dst[lo:hi]]
+    crossing = cu != cv
+    cu = cu[crossing]
+    cv = cv[crossing]
+    r = rank[lo:hi][crossing]
+    best = np.full(n, m, dtype=np.int32)
+    np.minimum.at(best, cu, r)
+    np.minimum.at(best, cv, r)
+    return best
+
+
+def _chunk_minima_python(comp, src, dst, rank, n, m, lo, hi):
+    best = array('i', [m]) * n
+    for k in range(lo, hi):
+        a = comp[src[k]]
+        b = comp[dst[k]]
+        if a != b:
+            r = rank[k]
+            if r < best[a]:
+                best[a] = r
+            if r < best[b]:
+                best[b] = r
+    return best
+
+
+# Benchmark against kruskal
+
+
+def random_edge_graph(n, m, seed=0):
+    import random
+    rng = random.Random(seed)
+    edges = [(v, rng.randrange(v), rng.randint(1, 1000)) for v in range(1, n)]
+    edges += [(rng.randrange(n), rng.randrange(n), rng.randint(1, 1000)) for _ in range(m - len(edges))]
+    return {'vertices': list(range(n)), 'edges': edges}
+
+
+def benchmark(n=100000, m=1000000):
+    from algorithms import kruskal
+    graph = random_edge_graph(n, m)
+    results = []
+    totals = set()
+    for name, func in (('kruskal', kruskal), ('kruskal_arrays', kruskal_arrays), ('boruvka', boruvka)):
+        t0 = time.perf_counter()
+        mst = func(graph)
+        results.append((name, time.perf_counter() - t0))
+        totals.add(sum(w for _, _, w in mst))
+    if len(totals) != 1:
+        raise AssertionError("MST weights disagree")
+    return results
+
+
+if __name__ == "__main__":
+    graph_kruskal = {
+        'vertices': ['A', 'B', 'C', 'D'],
+        'edges': [
+            ('A', 'B', 1),
+            ('A', 'C', 4),
+            ('B', 'C', 2),
+            ('B', 'D', 5),
+            ('C', 'D', 1)
+        ]
+    }
+    print("Kruskal (arrays):", kruskal_arrays(graph_kruskal))
+    print("Boruvka:", boruvka(graph_kruskal))
+    for name, seconds in benchmark():
+        print(f"{name:<16}{seconds:>10.3f}s")
@@ -0,0 +1,163 @@
+import heapq
+import os
+import time
+from array import array
+from multiprocessing import Pool
+from multiprocessing.shared_memory import SharedMemory
+
+from sorting import INT64_MAX, INT64_MIN, adaptive_sort
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# Multi-core parallel sort
+#
+# parallel_sort(arr, workers=None, algorithm=adaptive_sort) splits arr into
+# one chunk per worker, sorts the chunks in a process pool and k-way merges
+# the sorted chunks; like the multi-worker path, a single worker sorts arr
+# in place and returns it. Homogeneous int/float lists are copied once into a
+# SharedMemory block that the workers sort in place, so nothing but the
+# block name and slice bounds crosses the process boundary. Other element
+# types have no fixed-width layout, so their chunks are pickled to and from
+# the workers instead. `algorithm` must be a module-level function (for
+# example quick_sort, merge_sort or adaptive_sort) so it can be pickled.
+
+MIN_CHUNK = 50000
+
+
+def parallel_sort(arr, workers=None, algorithm=adaptive_sort):
+    n = len(arr)
+    workers = plan_workers(n, workers)
+    if workers <= 1:
+        arr[:] = algorithm(arr)
+        return arr
+    bounds = chunk_bounds(n, workers)
+    typecode = _shared_typecode(arr)
+    if typecode is None:
+        with Pool(workers) as pool:
+            chunks = pool.starmap(_sort_chunk, [(arr[lo:hi], algorithm) for lo, hi in bounds])
+        arr[:] = heapq.merge(*chunks)
+        return arr
+    # The block is created before the pool so the workers inherit the
+    # parent's resource tracker instead of starting their own, which would
+    # unlink the block when a worker exits
+    shm = SharedMemory(create=True, size=n * 8)
+    try:
+        view = shm.buf.cast('B').cast(typecode)
+        view[:] = array(typecode, arr)
+        with Pool(workers) as pool:
+            pool.starmap(_sort_shared, [(shm.name, typecode, n, lo, hi, algorithm) for lo, hi in bounds])
+        arr[:] = _merge_shared(view, bounds, typecode)
+        view.release()
+    finally:
+        shm.close()
+        shm.unlink()
+    return arr
+
+
+def plan_workers(n, workers=None):
+    # Never hand a worker less than MIN_CHUNK elements: below that the
+    # process round trip costs more than the sort itself
+    if workers is None:
+        workers = os.cpu_count() or 1
+    return max(1, min(workers, n // MIN_CHUNK))
+
+
+def chunk_bounds(n, chunks):
+    step, extra = divmod(n, chunks)
+    bounds = []
+    lo = 0
+    for i in range(chunks):
+        hi = lo + step + (1 if i < extra else 0)
+        bounds.append((lo, hi))
+        lo = hi
+    return bounds
+
+
+def _shared_typecode(arr):
+    if not arr:
+        return None
+    first = type(arr[0])
+    if first is float and all(type(x) is float for x in arr):
+        return 'd'
+    if first is int and all(type(x) is int for x in arr) and INT64_MIN <= min(arr) and max(arr) <= INT64_MAX:
+        return 'q'
+    return None
+
+
+def _sort_chunk(chunk, algorithm):
+    return algorithm(chunk)
+
+
+def _sort_shared(name, typecode, n, lo, hi, algorithm):
+    shm = SharedMemory(name=name)
+    try:
+        if np is not None and algorithm is adaptive_sort:
+            # Fast path: sort the slice of the shared block in place
+            dtype = np.float64 if typecode == 'd' else np.int64
+            np.ndarray((n,), dtype=dtype, buffer=shm.buf)[lo:hi].sort()
+        else:
+            view = shm.buf.cast('B').cast(typecode)
+            view[lo:hi] = array(typecode, algorithm(view[lo:hi].tolist()))
+            view.release()
+    finally:
+        shm.close()
+
+
+def _merge_shared(view, bounds, typecode):
+    if np is not None:
+        dtype = np.float64 if typecode == 'd' else np.int64
+        runs = [np.frombuffer(view, dtype=dtype)[lo:hi] for lo, hi in bounds]
+        # Pairwise merge tree. A stable sort of two concatenated sorted runs
+        # is a single linear merge (NumPy's timsort/radix sort finds the runs).
+        while len(runs) > 1:
+            merged = [np.sort(np.concatenate(runs[i:i + 2]), kind='stable') for i in range(0, len(runs), 2)]
+            runs = merged
+        return runs[0].tolist()
+    return list(heapq.merge(*(view[lo:hi].tolist() for lo, hi in bounds)))
+
+
+def self_check():
+    from algorithms import quick_sort
+    # quick_sort returns a new list: the single-worker path must still
+    # write the result back into arr
+    arr = [5, 3, 9, 1, 7]
+    result = parallel_sort(arr, workers=1, algorithm=quick_sort)
+    if arr != [1, 3, 5, 7, 9] or result is not arr:
+        raise AssertionError("parallel_sort(workers=1) did not sort arr in place")
+
+
+# Benchmark: speedup vs number of worker processes
+
+
+def benchmark(n=2000000, repeat=3, seed=0):
+    import random
+    rng = random.Random(seed)
+    data = [rng.random() for _ in range(n)]
+    expected = sorted(data)
+    cores = os.cpu_count() or 1
+    counts = sorted({1, 2, 4, 8, 16, 32, cores} & set(range(1, cores + 1)))
+    results = []
+    baseline = None
+    for workers in counts:
+        best = float('inf')
+        for _ in range(repeat):
+            arr = data.copy()
+            t0 = time.perf_counter()
+            parallel_sort(arr, workers=workers)
+            best = min(best, time.perf_counter() - t0)
+        if arr != expected:
+            raise AssertionError(f"parallel_sort with {workers} workers is wrong")
+        if baseline is None:
+            baseline = best
+        results.append((workers, best, baseline / best))
+    return results
+
+
+if __name__ == "__main__":
+    self_check()
+    print(f"{'workers':>8}{'seconds':>12}{'speedup':>10}")
+    for workers, seconds, speedup in benchmark():
+        print(f"{workers:>8}{seconds:>12.4f}{speedup:>10.2f}")
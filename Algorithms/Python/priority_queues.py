@@ -0,0 +1,282 @@
+import random
+import time
+
+# Addressable priority queues for Dijkstra/Prim
+#
+# Both queues keep a position index (item -> slot/node) so decrease_key can
+# update an entry in place instead of pushing a duplicate. Every queue
+# supports the same small interface:
+#   insert(item, priority), extract_min() -> (priority, item),
+#   decrease_key(item, priority), push_or_decrease(item, priority),
+#   priority(item), is_empty(), len(), `item in queue`
+
+
+class BinaryHeap:
+    def __init__(self):
+        self._items = []
+        self._prios = []
+        self._pos = {}
+
+    def __len__(self):
+        return len(self._items)
+
+    def __contains__(self, item):
+        return item in self._pos
+
+    def is_empty(self):
+        return len(self._items) == 0
+
+    def priority(self, item):
+        return self._prios[self._pos[item]]
+
+    def peek(self):
+        return self._prios[0], self._items[0]
+
+    def insert(self, item, priority):
+        if item in self._pos:
+            raise KeyError(f"{item!r} is already in the queue")
+        self._items.append(item)
+        self._prios.append(priority)
+        self._pos[item] = len(self._items) - 1
+        self._sift_up(len(self._items) - 1)
+
+    def extract_min(self):
+        items = self._items
+        prios = self._prios
+        item = items[0]
+        priority = prios[0]
+        last_item = items.pop()
+        last_prio = prios.pop()
+        del self._pos[item]
+        if items:
+            items[0] = last_item
+            prios[0] = last_prio
+            self._pos[last_item] = 0
+            self._sift_down(0)
+        return priority, item
+
+    def decrease_key(self, item, priority):
+        i = self._pos[item]
+        if priority > self._prios[i]:
+            raise ValueError("new priority is greater than the current one")
+        self._prios[i] = priority
+        self._sift_up(i)
+
+    def push_or_decrease(self, item, priority):
+        i = self._pos.get(item)
+        if i is None:
+            self.insert(item, priority)
+            return True
+        if priority < self._prios[i]:
+            self._prios[i] = priority
+            self._sift_up(i)
+            return True
+        return False
+
+    def _sift_up(self, i):
+        items = self._items
+        prios = self._prios
+        pos = self._pos
+        item = items[i]
+        priority = prios[i]
+        while i > 0:
+            parent = (i - 1) >> 1
+            if not priority < prios[parent]:
+                break
+            items[i] = items[parent]
+            prios[i] = prios[parent]
+            pos[items[i]] = i
+            i = parent
+        items[i] = item
+        prios[i] = priority
+        pos[item] = i
+
+    def _sift_down(self, i):
+        items = self._items
+        prios = self._prios
+        pos = self._pos
+        n = len(items)
+        item = items[i]
+        priority = prios[i]
+        while True:
+            child = 2*i + 1
+            if child >= n:
+                break
+            if child + 1 < n and prios[child + 1] < prios[child]:
+                child += 1
+            if not prios[child] < priority:
+                break
+            items[i] = items[child]
+            prios[i] = prios[child]
+            pos[items[i]] = i
+            i = child
+        items[i] = item
+        prios[i] = priority
+        pos[item] = i
+
+
+class _PairingNode:
+    __slots__ = ('item', 'priority', 'child', 'sibling', 'prev')
+
+    def __init__(self, item, priority):
+        self.item = item
+        self.priority = priority
+        self.child = None
+        self.sibling = None
+        # Parent if this node is the leftmost child, else the left sibling
+        self.prev = None
+
+
+class PairingHeap:
+    def __init__(self):
+        self._root = None
+        self._nodes = {}
+
+    def __len__(self):
+        return len(self._nodes)
+
+    def __contains__(self, item):
+        return item in self._nodes
+
+    def is_empty(self):
+        return self._root is None
+
+    def priority(self, item):
+        return self._nodes[item].priority
+
+    def peek(self):
+        return self._root.priority, self._root.item
+
+    def insert(self, item, priority):
+        if item in self._nodes:
+            raise KeyError(f"{item!r} is already in the queue")
+        node = _PairingNode(item, priority)
+        self._nodes[item] = node
+        self._root = node if self._root is None else self._meld(self._root, node)
+
+    def extract_min(self):
+        root = self._root
+        del self._nodes[root.item]
+        self._root = self._merge_pairs(root.child)
+        if self._root is not None:
+            self._root.prev = None
+            self._root.sibling = None
+        return root.priority, root.item
+
+    def decrease_key(self, item, priority):
+        node = self._nodes[item]
+        if priority > node.priority:
+            raise ValueError("new priority is greater than the current one")
+        node.priority = priority
+        if node is self._root:
+            return
+        self._detach(node)
+        self._root = self._meld(self._root, node)
+
+    def push_or_decrease(self, item, priority):
+        node = self._nodes.get(item)
+        if node is None:
+            self.insert(item, priority)
+            return True
+        if priority < node.priority:
+            self.decrease_key(item, priority)
+            return True
+        return False
+
+    @staticmethod
+    def _meld(a, b):
+        if b.priority < a.priority:
+            a, b = b, a
+        b.prev = a
+        b.sibling = a.child
+        if a.child is not None:
+            a.child.prev = b
+        a.child = b
+        return a
+
+    @staticmethod
+    def _detach(node):
+        prev = node.prev
+        if prev.child is node:
+            prev.child = node.sibling
+        else:
+            prev.sibling = node.sibling
+        if node.sibling is not None:
+            node.sibling.prev = prev
+        node.prev = None
+        node.sibling = None
+
+    def _merge_pairs(self, first):
+        # Two-pass pairing done iteratively so long child lists can't
+        # overflow the recursion limit
+        pairs = []
+        node = first
+        while node is not None:
+            a = node
+            b = a.sibling
+            if b is None:
+                a.prev = a.sibling = None
+                pairs.append(a)
+                break
+            node = b.sibling
+            a.prev = a.sibling = None
+            b.prev = b.sibling = None
+            pairs.append(self._meld(a, b))
+        if not pairs:
+            return None
+        root = pairs.pop()
+        while pairs:
+            root = self._meld(pairs.pop(), root)
+        return root
+
+
+# Benchmark: list-based pq functions vs heap backends
+
+
+def random_graph(n, avg_degree, max_weight=100, seed=0):
+    rng = random.Random(seed)
+    graph = {v: {} for v in range(n)}
+    # A random spanning tree keeps the graph connected so prim covers every vertex
+    for v in range(1, n):
+        u = rng.randrange(v)
+        w = rng.randint(1, max_weight)
+        graph[u][v] = w
+        graph[v][u] = w
+    for _ in range(n * (avg_degree - 2) // 2):
+        u = rng.randrange(n)
+        v = rng.randrange(n)
+        if u != v:
+            w = rng.randint(1, max_weight)
+            graph[u][v] = w
+            graph[v][u] = w
+    return graph
+
+
+def benchmark(sizes=(1000, 2000, 4000, 8000), avg_degree=8, repeat=3):
+    from algorithms import dijkstra, prim
+    backends = [("list", None), ("binary", BinaryHeap), ("pairing", PairingHeap)]
+    results = []
+    for n in sizes:
+        graph = random_graph(n, avg_degree)
+        for name, func in (("dijkstra", dijkstra), ("prim", prim)):
+            expected = None
+            for backend, pq_class in backends:
+                best = float('inf')
+                for _ in range(repeat):
+                    t0 = time.perf_counter()
+                    out = func(graph, 0, pq_class=pq_class)
+                    best = min(best, time.perf_counter() - t0)
+                if expected is None:
+                    expected = out
+                elif name == "dijkstra" and out != expected:
+                    raise AssertionError(f"{backend} dijkstra disagrees with list backend")
+                elif name == "prim" and sum(w for _, _, w in out) != sum(w for _, _, w in expected):
+                    raise AssertionError(f"{backend} prim disagrees with list backend")
+                results.append((name, n, backend, best))
+    return results
+
+
+if __name__ == "__main__":
+    print(f"{'algorithm':<10}{'n':>8}{'backend':>10}{'seconds':>12}")
+    for name, n, backend, seconds in benchmark():
+        print(f"{name:<10}{n:>8}{backend:>10}{seconds:>12.4f}")
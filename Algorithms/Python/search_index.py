@@ -0,0 +1,150 @@
+import time
+from bisect import bisect_left, bisect_right
+
+from algorithms import binary_search
+from sorting import numpy_eligible, adaptive_sort
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# Reusable sorted index
+#
+# SortedIndex sorts its input once and then answers many queries:
+#   search(x)              - position of x in the sorted values, or -1
+#   search_many(xs)        - batch search; NumPy searchsorted when the values
+#                            are numeric, otherwise one sorted sweep
+#   lower_bound/upper_bound, range_query(lo, hi), count_range(lo, hi)
+# Scalar search walks an Eytzinger (BFS-order) copy of the values: the first
+# levels of the implicit tree sit next to each other in memory, so the top
+# of every search path stays in cache.
+
+
+class SortedIndex:
+    def __init__(self, arr, presorted=False):
+        values = list(arr) if presorted else adaptive_sort(list(arr))
+        self.values = values
+        self._array = np.asarray(values) if values and numpy_eligible(values) else None
+        self._eytzinger, self._rank = _eytzinger_layout(values)
+
+    def __len__(self):
+        return len(self.values)
+
+    def lower_bound(self, target):
+        return bisect_left(self.values, target)
+
+    def upper_bound(self, target):
+        return bisect_right(self.values, target)
+
+    def search(self, target):
+        tree = self._eytzinger
+        n = len(tree) - 1
+        k = 1
+        while k <= n:
+            k = 2*k + (tree[k] < target)
+        # Drop the trailing right turns (and one more) to get the node where
+        # the path last went left: that node holds the lower bound
+        k >>= ((~k) & (k + 1)).bit_length()
+        if k and tree[k] == target:
+            return self._rank[k]
+        return -1
+
+    def __contains__(self, target):
+        return self.search(target) != -1
+
+    def search_many(self, targets):
+        if self._array is not None:
+            targets = np.asarray(targets)
+            if targets.dtype.kind in 'iuf':
+                idx = np.searchsorted(self._array, targets)
+                clipped = np.minimum(idx, len(self._array) - 1)
+                return np.where(self._array[clipped] == targets, idx, -1)
+        targets = list(targets)
+        # Visit the targets in sorted order so each lookup resumes from the
+        # previous position instead of starting from the root again
+        values = self.values
+        n = len(values)
+        result = [-1] * len(targets)
+        lo = 0
+        for i in adaptive_sort(list(range(len(targets))), key=targets.__getitem__):
+            target = targets[i]
+            lo = bisect_left(values, target, lo)
+            if lo < n and values[lo] == target:
+                result[i] = lo
+        return result
+
+    def contains_many(self, targets):
+        found = self.search_many(targets)
+        if self._array is not None and hasattr(found, 'dtype'):
+            return found != -1
+        return [i != -1 for i in found]
+
+    def range_query(self, low, high):
+        return self.values[bisect_left(self.values, low):bisect_right(self.values, high)]
+
+    def count_range(self, low, high):
+        return max(0, bisect_right(self.values, high) - bisect_left(self.values, low))
+
+
+def _eytzinger_layout(values):
+    # tree[1..n] holds the values in BFS order of the implicit search tree
+    # and rank[k] is the sorted position of tree[k]
+    n = len(values)
+    tree = [None] * (n + 1)
+    rank = [0] * (n + 1)
+    i = 0
+    # In-order walk of the implicit tree, done iteratively
+    stack = []
+    k = 1
+    while stack or k <= n:
+        while k <= n:
+            stack.append(k)
+            k = 2*k
+        k = stack.pop()
+        tree[k] = values[i]
+        rank[k] = i
+        i += 1
+        k = 2*k + 1
+    return tree, rank
+
+
+# Benchmark: throughput against binary_search in a loop
+
+
+def benchmark(n=1000000, queries=200000, seed=0):
+    import random
+    rng = random.Random(seed)
+    values = sorted(rng.sample(range(n * 4), n))
+    targets = [rng.randrange(n * 4) for _ in range(queries)]
+    t0 = time.perf_counter()
+    index = SortedIndex(values, presorted=True)
+    build = time.perf_counter() - t0
+
+    results = [('build', build, 0)]
+    t0 = time.perf_counter()
+    expected = [binary_search(values, t) for t in targets]
+    results.append(('binary_search loop', time.perf_counter() - t0, queries))
+    t0 = time.perf_counter()
+    scalar = [index.search(t) for t in targets]
+    results.append(('SortedIndex.search loop', time.perf_counter() - t0, queries))
+    t0 = time.perf_counter()
+    batch = list(index.search_many(targets))
+    results.append(('SortedIndex.search_many', time.perf_counter() - t0, queries))
+    # Values are distinct, so every method must report the same positions
+    if scalar != expected or [int(i) for i in batch] != expected:
+        raise AssertionError("SortedIndex disagrees with binary_search")
+    return results
+
+
+if __name__ == "__main__":
+    index = SortedIndex([64, 34, 25, 12, 22, 11, 90])
+    print("Sorted Index:", index.values)
+    print("Search 22:", index.search(22), "Search 23:", index.search(23))
+    print("Search Many:", [int(i) for i in index.search_many([90, 11, 5])])
+    print("Range [20, 60]:", index.range_query(20, 60))
+
+    print(f"{'method':<26}{'seconds':>10}{'queries/s':>14}")
+    for name, seconds, queries in benchmark():
+        rate = f"{queries / seconds:>14,.0f}" if queries else f"{'-':>14}"
+        print(f"{name:<26}{seconds:>10.4f}{rate}")
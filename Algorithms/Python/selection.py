@@ -0,0 +1,235 @@
+import time
+from itertools import count, islice
+
+from algorithms import heapify, insertion_sort
+from sorting import SMALL_SORT, adaptive_sort, median_of_three
+
+# Selection and top-k
+#
+#   nsmallest(iterable, k, key=None) / nlargest(...) - the k smallest/largest
+#       elements in order, equal to sorted(...)[:k] (ties keep input order),
+#       from a bounded heap of k entries: O(n log k) time, O(k) memory
+#   TopK(k, key=None, largest=True) - the same bounded heap as a streaming
+#       accumulator: push()/extend() as items arrive, items() at any point;
+#       the full input is never held
+#   introselect(arr, k) - in place: moves the k-th smallest (0-based) to
+#       arr[k] with smaller elements before it and larger ones after, and
+#       returns it. Three-way quickselect with median-of-three pivots; once
+#       too many partitions fail to shrink the range by a quarter, pivots
+#       come from median-of-medians instead, so the worst case stays O(n)
+#   select(arr, k), median(arr) - the same without touching arr
+#   partial_sort(arr, k) - in place: arr[:k] becomes the k smallest, sorted
+#
+# The smallest-k heap is a max-heap maintained with algorithms.heapify;
+# the largest-k heap uses the mirror-image _sift_down_min.
+
+
+def _sift_down_min(heap, n, i):
+    while True:
+        smallest = i
+        l = 2*i + 1
+        r = 2*i + 2
+        if l < n and heap[l] < heap[smallest]:
+            smallest = l
+        if r < n and heap[r] < heap[smallest]:
+            smallest = r
+        if smallest == i:
+            return
+        heap[i], heap[smallest] = heap[smallest], heap[i]
+        i = smallest
+
+
+class TopK:
+    def __init__(self, k, key=None, largest=True):
+        self.k = max(0, k)
+        self.key = key
+        self.largest = largest
+        # With a key, entries are (key, tiebreak, item): the tiebreak is the
+        # arrival index (negated for largest) so earlier items win ties and
+        # the items themselves are never compared
+        self._heap = []
+        self._seen = 0
+
+    def __len__(self):
+        return len(self._heap)
+
+    def push(self, item):
+        return self.extend((item,))
+
+    def extend(self, iterable):
+        k = self.k
+        if k == 0:
+            return self
+        heap = self._heap
+        largest = self.largest
+        if self.key is None:
+            entries = iter(iterable)
+        else:
+            key = self.key
+            # zip pulls from the iterable first, so the counter only advances
+            # for items that were actually consumed
+            counter = count(-self._seen, -1) if largest else count(self._seen)
+            entries = ((key(item), i, item) for item, i in zip(iterable, counter))
+        sift = _sift_down_min if largest else heapify
+        if len(heap) < k:
+            heap.extend(islice(entries, k - len(heap)))
+            if len(heap) == k:
+                for i in range(k//2 - 1, -1, -1):
+                    sift(heap, k, i)
+        if len(heap) == k:
+            top = heap[0]
+            if largest:
+                for entry in entries:
+                    if top < entry:
+                        heap[0] = entry
+                        sift(heap, k, 0)
+                        top = heap[0]
+            else:
+                for entry in entries:
+                    if entry < top:
+                        heap[0] = entry
+                        sift(heap, k, 0)
+                        top = heap[0]
+        if self.key is not None:
+            self._seen = abs(next(counter))
+        return self
+
+    def items(self):
+        entries = adaptive_sort(list(self._heap), reverse=self.largest)
+        if self.key is None:
+            return entries
+        return [entry[2] for entry in entries]
+
+
+def nsmallest(iterable, k, key=None):
+    return TopK(k, key, largest=False).extend(iterable).items()
+
+
+def nlargest(iterable, k, key=None):
+    return TopK(k, key, largest=True).extend(iterable).items()
+
+
+def introselect(arr, k, lo=0, hi=None):
+    if hi is None:
+        hi = len(arr) - 1
+    if not lo <= k <= hi:
+        raise IndexError("selection index out of range")
+    return _introselect(arr, k, lo, hi, (hi - lo + 1).bit_length())
+
+
+def _introselect(arr, k, lo, hi, budget):
+    while hi - lo >= SMALL_SORT:
+        size = hi - lo + 1
+        if budget > 0:
+            pivot = median_of_three(arr[lo], arr[(lo + hi) // 2], arr[hi])
+        else:
+            pivot = _median_of_medians(arr, lo, hi)
+        # Three-way partition: arr[lo:lt] < pivot, arr[lt:gt+1] == pivot,
+        # arr[gt+1:hi+1] > pivot
+        lt, i, gt = lo, lo, hi
+        while i <= gt:
+            x = arr[i]
+            if x < pivot:
+                arr[lt], arr[i] = x, arr[lt]
+                lt += 1
+                i += 1
+            elif pivot < x:
+                arr[gt], arr[i] = x, arr[gt]
+                gt -= 1
+            else:
+                i += 1
+        if k < lt:
+            hi = lt - 1
+        elif k > gt:
+            lo = gt + 1
+        else:
+            return arr[k]
+        if 4 * (hi - lo + 1) > 3 * size:
+            budget -= 1
+    arr[lo:hi + 1] = insertion_sort(arr[lo:hi + 1])
+    return arr[k]
+
+
+def _median_of_medians(arr, lo, hi):
+    medians = []
+    for start in range(lo, hi + 1, 5):
+        group = insertion_sort(arr[start:min(start + 5, hi + 1)])
+        medians.append(group[(len(group) - 1) // 2])
+    # No budget: the medians are selected with median-of-medians pivots all
+    # the way down, which is what makes the fallback linear
+    return _introselect(medians, (len(medians) - 1) // 2, 0, len(medians) - 1, 0)
+
+
+def select(arr, k):
+    arr = list(arr)
+    if k < 0:
+        k += len(arr)
+    return introselect(arr, k)
+
+
+def median(arr):
+    arr = list(arr)
+    n = len(arr)
+    if n == 0:
+        raise ValueError("median of an empty sequence")
+    upper = introselect(arr, n // 2)
+    if n % 2:
+        return upper
+    # Everything before n//2 is now <= upper, so the lower middle is their max
+    return (max(arr[:n // 2]) + upper) / 2
+
+
+def partial_sort(arr, k):
+    n = len(arr)
+    if k <= 0:
+        return arr
+    if k >= n:
+        return adaptive_sort(arr)
+    introselect(arr, k - 1)
+    arr[:k] = adaptive_sort(arr[:k])
+    return arr
+
+
+# Benchmark: selection against sorting everything
+
+
+def benchmark(n=200000, k=100, seed=0):
+    import heapq
+    import random
+    from algorithms import heap_sort, quick_sort
+    rng = random.Random(seed)
+    data = [rng.random() for _ in range(n)]
+    expected_small = sorted(data)[:k]
+    expected_median = sorted(data)[n // 2]
+    runs = [
+        ('heap_sort()[:k]', lambda: heap_sort(data.copy())[:k], expected_small),
+        ('quick_sort()[:k]', lambda: quick_sort(data.copy())[:k], expected_small),
+        ('heapq.nsmallest', lambda: heapq.nsmallest(k, data), expected_small),
+        ('nsmallest', lambda: nsmallest(data, k), expected_small),
+        ('TopK over a generator', lambda: TopK(k, largest=False).extend(x for x in data).items(), expected_small),
+        ('partial_sort()[:k]', lambda: partial_sort(data.copy(), k)[:k], expected_small),
+        ('heap_sort()[n//2]', lambda: heap_sort(data.copy())[n // 2], expected_median),
+        ('select(n//2)', lambda: select(data, n // 2), expected_median),
+    ]
+    results = []
+    for name, run, expected in runs:
+        t0 = time.perf_counter()
+        out = run()
+        results.append((name, time.perf_counter() - t0))
+        if out != expected:
+            raise AssertionError(f"{name} returned the wrong result")
+    return results
+
+
+if __name__ == "__main__":
+    arr = [64, 34, 25, 12, 22, 11, 90]
+    print("3 Smallest:", nsmallest(arr, 3))
+    print("3 Largest:", nlargest(arr, 3))
+    print("Median:", median(arr))
+    print("Partial Sort (k=3):", partial_sort(arr.copy(), 3)[:3])
+    words = ["pear", "fig", "apple", "kiwi", "plum", "banana"]
+    print("2 Longest Words:", nlargest(words, 2, key=len))
+
+    print(f"{'method':<24}{'seconds':>10}")
+    for name, seconds in benchmark():
+        print(f"{name:<24}{seconds:>10.4f}")
@@ -0,0 +1,247 @@
+import math
+import random
+import time
+
+from algorithms import dijkstra
+from priority_queues import BinaryHeap
+
+# Point-to-point shortest path queries
+#
+# All queries take the dict-of-dicts graph used by dijkstra and return
+# (distance, path); an unreachable target gives (inf, []). Pass a dict as
+# `stats` to get the number of settled nodes back in stats['settled'].
+#   shortest_path          - Dijkstra that stops once the target is settled
+#   bidirectional_dijkstra - searches forward from the source and backward
+#                            from the target until the frontiers meet
+#   astar                  - goal-directed search with a heuristic(node, target)
+#                            that never overestimates the remaining distance;
+#                            an inconsistent one can find a shorter path to a
+#                            settled node, which is then reopened
+#   Landmarks              - ALT preprocessing: distances to/from a few
+#                            landmarks give an A* heuristic via the triangle
+#                            inequality, reused across queries on a static graph
+
+INF = float('inf')
+
+
+def reverse_graph(graph):
+    reverse = {node: {} for node in graph}
+    for u, adjacent in graph.items():
+        for v, w in adjacent.items():
+            reverse.setdefault(v, {})[u] = w
+    return reverse
+
+
+def build_path(pred, target):
+    path = [target]
+    while pred[path[-1]] is not None:
+        path.append(pred[path[-1]])
+    path.reverse()
+    return path
+
+
+def shortest_path(graph, source, target, pq_class=BinaryHeap, stats=None):
+    return astar(graph, source, target, None, pq_class, stats)
+
+
+def astar(graph, source, target, heuristic, pq_class=BinaryHeap, stats=None):
+    # With heuristic=None this is plain Dijkstra with an early exit
+    dist = {source: 0}
+    pred = {source: None}
+    settled = set()
+    pq = pq_class()
+    pq.insert(source, heuristic(source, target) if heuristic else 0)
+    while not pq.is_empty():
+        _, node = pq.extract_min()
+        settled.add(node)
+        if node == target:
+            break
+        d = dist[node]
+        for neighbor, weight in graph[node].items():
+            candidate = d + weight
+            if candidate < dist.get(neighbor, INF):
+                dist[neighbor] = candidate
+                pred[neighbor] = node
+                settled.discard(neighbor)
+                estimate = candidate + (heuristic(neighbor, target) if heuristic else 0)
+                pq.push_or_decrease(neighbor, estimate)
+    if stats is not None:
+        stats['settled'] = len(settled)
+    if target not in settled:
+        return INF, []
+    return dist[target], build_path(pred, target)
+
+
+def bidirectional_dijkstra(graph, source, target, reverse=None, pq_class=BinaryHeap, stats=None):
+    if reverse is None:
+        reverse = reverse_graph(graph)
+    if source == target:
+        if stats is not None:
+            stats['settled'] = 1
+        return 0, [source]
+    sides = [
+        (graph, {source: 0}, {source: None}, set(), pq_class()),
+        (reverse, {target: 0}, {target: None}, set(), pq_class()),
+    ]
+    sides[0][4].insert(source, 0)
+    sides[1][4].insert(target, 0)
+    best = INF
+    meeting = None
+    while not sides[0][4].is_empty() and not sides[1][4].is_empty():
+        # Once the two smallest keys add up to the best path found, no
+        # shorter path can still go through an unsettled node
+        if sides[0][4].peek()[0] + sides[1][4].peek()[0] >= best:
+            break
+        # Expand the side with the smaller frontier
+        side = 0 if len(sides[0][4]) <= len(sides[1][4]) else 1
+        adjacency, dist, pred, settled, pq = sides[side]
+        other_dist = sides[1 - side][1]
+        d, node = pq.extract_min()
+        settled.add(node)
+        for neighbor, weight in adjacency[node].items():
+            if neighbor in settled:
+                continue
+            candidate = d + weight
+            if candidate < dist.get(neighbor, INF):
+                dist[neighbor] = candidate
+                pred[neighbor] = node
+                pq.push_or_decrease(neighbor, candidate)
+            if neighbor in other_dist and candidate + other_dist[neighbor] < best:
+                best = candidate + other_dist[neighbor]
+                meeting = neighbor
+        if node in other_dist and d + other_dist[node] < best:
+            best = d + other_dist[node]
+            meeting = node
+    if stats is not None:
+        stats['settled'] = len(sides[0][3]) + len(sides[1][3])
+    if meeting is None:
+        return INF, []
+    forward = build_path(sides[0][2], meeting)
+    backward = build_path(sides[1][2], meeting)
+    return best, forward + backward[::-1][1:]
+
+
+class Landmarks:
+    def __init__(self, graph, count=8, landmarks=None, seed=0):
+        self.graph = graph
+        self.reverse = reverse_graph(graph)
+        if landmarks is None:
+            landmarks = self._farthest_landmarks(count, seed)
+        self.landmarks = list(landmarks)
+        # from_landmark[i][v] = d(L_i, v), to_landmark[i][v] = d(v, L_i)
+        self.from_landmark = [dijkstra(graph, L, pq_class=BinaryHeap) for L in self.landmarks]
+        self.to_landmark = [dijkstra(self.reverse, L, pq_class=BinaryHeap) for L in self.landmarks]
+
+    def _farthest_landmarks(self, count, seed):
+        # Farthest-point selection: each new landmark is the node farthest
+        # from the ones already chosen (unreachable nodes count as farthest,
+        # so other components get a landmark too)
+        nodes = list(self.graph)
+        chosen = [random.Random(seed).choice(nodes)]
+        nearest = dijkstra(self.graph, chosen[0], pq_class=BinaryHeap)
+        while len(chosen) < min(count, len(nodes)):
+            node, d = max(((n, d) for n, d in nearest.items() if n not in chosen), key=lambda item: item[1])
+            if d == 0:
+                break
+            chosen.append(node)
+            for n, d in dijkstra(self.graph, node, pq_class=BinaryHeap).items():
+                if d < nearest[n]:
+                    nearest[n] = d
+        return chosen
+
+    def heuristic(self, node, target):
+        bound = 0
+        for from_l, to_l in zip(self.from_landmark, self.to_landmark):
+            # d(L, t) - d(L, v) <= d(v, t) and d(v, L) - d(t, L) <= d(v, t)
+            a = from_l.get(target, INF) - from_l.get(node, INF)
+            b = to_l.get(node, INF) - to_l.get(target, INF)
+            for value in (a, b):
+                if value > bound and not math.isinf(value) and not math.isnan(value):
+                    bound = value
+        return bound
+
+    def query(self, source, target, pq_class=BinaryHeap, stats=None):
+        return astar(self.graph, source, target, self.heuristic, pq_class, stats)
+
+
+# Benchmark: settled nodes and time per query
+
+
+def grid_graph(width, height, seed=0):
+    # Road-network-like test graph: a grid with random positive weights
+    rng = random.Random(seed)
+    graph = {}
+    for x in range(width):
+        for y in range(height):
+            graph[(x, y)] = {}
+    for x in range(width):
+        for y in range(height):
+            for nx, ny in ((x + 1, y), (x, y + 1)):
+                if nx < width and ny < height:
+                    w = rng.randint(1, 10)
+                    graph[(x, y)][(nx, ny)] = w
+                    graph[(nx, ny)][(x, y)] = w
+    return graph
+
+
+def benchmark(width=100, height=100, queries=50, seed=0):
+    graph = grid_graph(width, height, seed)
+    rng = random.Random(seed)
+    nodes = list(graph)
+    pairs = [(rng.choice(nodes), rng.choice(nodes)) for _ in range(queries)]
+    reverse = reverse_graph(graph)
+    t0 = time.perf_counter()
+    landmarks = Landmarks(graph, count=8)
+    preprocessing = time.perf_counter() - t0
+    methods = [
+        ('dijkstra (full)', None),
+        ('shortest_path', lambda s, t, st: shortest_path(graph, s, t, stats=st)),
+        ('bidirectional', lambda s, t, st: bidirectional_dijkstra(graph, s, t, reverse, stats=st)),
+        ('astar (manhattan)', lambda s, t, st: astar(graph, s, t, lambda v, g: abs(v[0] - g[0]) + abs(v[1] - g[1]), stats=st)),
+        ('ALT (8 landmarks)', lambda s, t, st: landmarks.query(s, t, stats=st)),
+    ]
+    expected = [dijkstra(graph, s, pq_class=BinaryHeap)[t] for s, t in pairs]
+    results = []
+    for name, query in methods:
+        settled = 0
+        t0 = time.perf_counter()
+        for (s, t), want in zip(pairs, expected):
+            if query is None:
+                distances = dijkstra(graph, s, pq_class=BinaryHeap)
+                settled += sum(1 for d in distances.values() if d < INF)
+                continue
+            stats = {}
+            distance, path = query(s, t, stats)
+            if distance != want or sum(graph[a][b] for a, b in zip(path, path[1:])) != want:
+                raise AssertionError(f"{name} disagrees with dijkstra")
+            settled += stats['settled']
+        results.append((name, (time.perf_counter() - t0) / queries, settled / queries))
+    return preprocessing, results
+
+
+def self_check():
+    # Admissible but inconsistent heuristic: B is settled through S->B
+    # before A is expanded, and has to be reopened to find S->A->B->T
+    graph = {'S': {'A': 1, 'B': 4}, 'A': {'B': 1}, 'B': {'T': 5}, 'T': {}}
+    h = {'S': 0, 'A': 5, 'B': 0, 'T': 0}
+    result = astar(graph, 'S', 'T', lambda node, target: h[node])
+    if result != (7, ['S', 'A', 'B', 'T']):
+        raise AssertionError(f"astar returned {result} with an inconsistent heuristic")
+
+
+if __name__ == "__main__":
+    self_check()
+    graph_dijkstra = {
+        'A': {'B': 1, 'C': 4},
+        'B': {'A': 1, 'C': 2, 'D': 5},
+        'C': {'A': 4, 'B': 2, 'D': 1},
+        'D': {'B': 5, 'C': 1}
+    }
+    print("Shortest Path A->D:", shortest_path(graph_dijkstra, 'A', 'D'))
+    print("Bidirectional A->D:", bidirectional_dijkstra(graph_dijkstra, 'A', 'D'))
+
+    preprocessing, results = benchmark()
+    print(f"ALT preprocessing: {preprocessing:.3f}s")
+    print(f"{'method':<20}{'ms/query':>10}{'settled/query':>16}")
+    for name, seconds, settled in results:
+        print(f"{name:<20}{seconds * 1000:>10.2f}{settled:>16.0f}")
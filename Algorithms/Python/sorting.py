@@ -0,0 +1,267 @@
+import random
+import time
+
+from algorithms import insertion_sort, merge_sort, quick_sort
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# Adaptive hybrid sort
+#
+# adaptive_sort(arr, key=None, reverse=False, stable=True) sorts arr in place
+# and returns it, picking one of these strategies from the input:
+#   insertion  - tiny inputs go straight to insertion_sort
+#   numpy      - homogeneous int/float lists without a key use np.sort
+#   runs       - natural merge sort: detect ascending/descending runs, pad
+#                short runs with insertion sort, then merge neighbouring runs
+#                (stable, O(n) on presorted input)
+#   three_way  - iterative three-way quicksort for unstable sorts, so long
+#                stretches of equal keys are finished in a single partition
+#
+# With key= the elements are decorated as (key, index) pairs, which keeps the
+# result stable whatever strategy is used and never compares the elements
+# themselves.
+
+SMALL_SORT = 32
+NUMPY_MIN = 256
+INT64_MIN = -2**63
+INT64_MAX = 2**63 - 1
+
+
+def choose_strategy(arr, key=None, stable=True):
+    n = len(arr)
+    if n <= SMALL_SORT:
+        return 'insertion'
+    if key is None and n >= NUMPY_MIN and numpy_eligible(arr):
+        return 'numpy'
+    if stable or key is not None:
+        return 'runs'
+    if count_runs(arr) <= n // SMALL_SORT:
+        return 'runs'
+    return 'three_way'
+
+
+def adaptive_sort(arr, key=None, reverse=False, stable=True):
+    strategy = choose_strategy(arr, key, stable)
+    # Reversing before and after an ascending stable sort keeps equal
+    # elements in their original order, like sorted(..., reverse=True)
+    if strategy == 'numpy':
+        values = np.asarray(arr)
+        if reverse:
+            arr[:] = np.sort(values[::-1], kind='stable')[::-1].tolist()
+        else:
+            arr[:] = np.sort(values, kind='stable').tolist()
+        return arr
+    if key is None:
+        items = arr
+        if reverse:
+            items.reverse()
+    else:
+        values = arr[::-1] if reverse else arr[:]
+        items = [(key(x), i) for i, x in enumerate(values)]
+    if strategy == 'insertion':
+        items[:] = insertion_sort(items)
+    elif strategy == 'runs':
+        natural_merge_sort(items)
+    else:
+        three_way_quick_sort(items)
+    if reverse:
+        items.reverse()
+    if key is not None:
+        arr[:] = [values[i] for _, i in items]
+    return arr
+
+
+def numpy_eligible(arr):
+    if np is None:
+        return False
+    first = type(arr[0])
+    if first is float:
+        return all(type(x) is float for x in arr)
+    if first is int:
+        return all(type(x) is int for x in arr) and INT64_MIN <= min(arr) and max(arr) <= INT64_MAX
+    return False
+
+
+def count_runs(arr):
+    # Same run detection as natural_merge_sort, without touching arr
+    n = len(arr)
+    runs = 0
+    i = 0
+    while i < n:
+        j = i + 1
+        if j < n and arr[j] < arr[i]:
+            while j < n and arr[j] < arr[j - 1]:
+                j += 1
+        else:
+            while j < n and not arr[j] < arr[j - 1]:
+                j += 1
+        runs += 1
+        i = j
+    return runs
+
+
+def natural_merge_sort(arr):
+    n = len(arr)
+    runs = []
+    i = 0
+    while i < n:
+        j = i + 1
+        if j < n and arr[j] < arr[i]:
+            # Only strictly descending runs are reversed, so stability holds
+            while j < n and arr[j] < arr[j - 1]:
+                j += 1
+            arr[i:j] = arr[i:j][::-1]
+        else:
+            while j < n and not arr[j] < arr[j - 1]:
+                j += 1
+        if j - i < SMALL_SORT and j < n:
+            j = min(i + SMALL_SORT, n)
+            arr[i:j] = insertion_sort(arr[i:j])
+        runs.append(j)
+        i = j
+    # Merge neighbouring runs pairwise until one run is left
+    bounds = [0] + runs
+    while len(bounds) > 2:
+        merged = [0]
+        for k in range(2, len(bounds), 2):
+            _merge(arr, bounds[k - 2], bounds[k - 1], bounds[k])
+            merged.append(bounds[k])
+        if len(bounds) % 2 == 0:
+            merged.append(bounds[-1])
+        bounds = merged
+    return arr
+
+
+def _merge(arr, lo, mid, hi):
+    if not arr[mid] < arr[mid - 1]:
+        return
+    # Only the left run is copied out; the right run is read in place
+    left = arr[lo:mid]
+    i = 0
+    j = mid
+    k = lo
+    n_left = len(left)
+    while i < n_left and j < hi:
+        if arr[j] < left[i]:
+            arr[k] = arr[j]
+            j += 1
+        else:
+            arr[k] = left[i]
+            i += 1
+        k += 1
+    if i < n_left:
+        arr[k:hi] = left[i:]
+
+
+def three_way_quick_sort(arr):
+    stack = [(0, len(arr) - 1)]
+    while stack:
+        lo, hi = stack.pop()
+        if hi - lo < SMALL_SORT:
+            arr[lo:hi + 1] = insertion_sort(arr[lo:hi + 1])
+            continue
+        pivot = median_of_three(arr[lo], arr[(lo + hi) // 2], arr[hi])
+        lt, i, gt = lo, lo, hi
+        while i <= gt:
+            x = arr[i]
+            if x < pivot:
+                arr[lt], arr[i] = x, arr[lt]
+                lt += 1
+                i += 1
+            elif pivot < x:
+                arr[gt], arr[i] = x, arr[gt]
+                gt -= 1
+            else:
+                i += 1
+        # Push the larger side first so the stack stays O(log n) deep
+        if lt - lo > hi - gt:
+            stack.append((lo, lt - 1))
+            stack.append((gt + 1, hi))
+        else:
+            stack.append((gt + 1, hi))
+            stack.append((lo, lt - 1))
+    return arr
+
+
+def median_of_three(a, b, c):
+    if a < b:
+        if b < c:
+            return b
+        return c if a < c else a
+    if a < c:
+        return a
+    return c if b < c else b
+
+
+# Benchmark: adaptive_sort vs quick_sort and merge_sort
+
+
+def generate_inputs(n, seed=0):
+    rng = random.Random(seed)
+    data = [rng.random() for _ in range(n)]
+    return {
+        'random': data,
+        'sorted': sorted(data),
+        'reversed': sorted(data, reverse=True),
+        'few_unique': [rng.randrange(8) for _ in range(n)],
+        'strings': [str(x) for x in data],
+    }
+
+
+def benchmark(n=50000, repeat=3):
+    sorts = [
+        ('quick_sort', quick_sort),
+        ('merge_sort', merge_sort),
+        ('adaptive', adaptive_sort),
+        ('adaptive_unstable', lambda arr: adaptive_sort(arr, stable=False)),
+    ]
+    results = []
+    for case, data in generate_inputs(n).items():
+        expected = sorted(data)
+        for name, func in sorts:
+            best = float('inf')
+            for _ in range(repeat):
+                arr = data.copy()
+                t0 = time.perf_counter()
+                out = func(arr)
+                best = min(best, time.perf_counter() - t0)
+            if out != expected:
+                raise AssertionError(f"{name} failed on {case}")
+            results.append((case, name, best))
+    return results
+
+
+def self_check(rounds=200, seed=0):
+    # Compared by repr, so 0.0 and -0.0 (or 1 and 1.0) must come out in the
+    # same order as sorted() puts them
+    rng = random.Random(seed)
+    for _ in range(rounds):
+        n = rng.choice([10, 300, 1000])
+        cases = [[0.0, -0.0] * (n // 2) + [rng.random() for _ in range(n)],
+                 [rng.choice([0.0, -0.0, 1.0, -1.0]) for _ in range(n)],
+                 [rng.choice([1, 1.0, 0, 0.0, -0.0, 2, 2.5]) for _ in range(n)],
+                 [rng.randrange(10) for _ in range(n)]]
+        for data in cases:
+            for reverse in (False, True):
+                for key in (None, abs):
+                    out = adaptive_sort(data.copy(), key=key, reverse=reverse)
+                    expected = sorted(data, key=key, reverse=reverse)
+                    if list(map(repr, out)) != list(map(repr, expected)):
+                        raise AssertionError(f"adaptive_sort(key={key}, reverse={reverse}) differs from sorted "
+                                             f"on n={len(data)} ({choose_strategy(data, key)})")
+
+
+if __name__ == "__main__":
+    self_check()
+    print("adaptive_sort matches sorted")
+    arr = [64, 34, 25, 12, 22, 11, 90]
+    print("Adaptive Sort:", adaptive_sort(arr.copy()))
+    print("Adaptive Sort (reverse):", adaptive_sort(arr.copy(), reverse=True))
+    print("Adaptive Sort (key=abs):", adaptive_sort([-5, 3, -1, 4], key=abs))
+
+    print(f"{'input':<12}{'sort':>20}{'seconds':>12}")
+    for case, name, seconds in benchmark():
+        print(f"{case:<12}{name:>20}{seconds:>12.4f}")
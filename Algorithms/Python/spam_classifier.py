@@ -0,0 +1,245 @@
+import math
+import os
+import time
+import zlib
+from collections import deque
+from itertools import count, islice
+from multiprocessing import Pool
+
+# Trainable multinomial naive Bayes spam classifier
+#
+# Words are split the same way as spam_filter_using_naive_bayes
+# (email.lower().split()) and mapped to feature ids either by hashing
+# (crc32 modulo n_features: fixed memory, identical in every process) or
+# through an interned vocabulary dict. partial_fit only adds to the count
+# tables, so the model can be trained incrementally; the log-probability
+# tables used for scoring are rebuilt lazily after each fit.
+
+SPAM = "Spam"
+HAM = "Not Spam"
+DEFAULT_FEATURES = 1 << 18
+HASH_CACHE_SIZE = 1 << 20
+
+
+class MultinomialNaiveBayes:
+    def __init__(self, vocabulary='hash', n_features=DEFAULT_FEATURES, alpha=1.0, classes=(HAM, SPAM)):
+        if vocabulary not in ('hash', 'dict'):
+            raise ValueError("vocabulary must be 'hash' or 'dict'")
+        self.vocabulary = vocabulary
+        self.n_features = n_features
+        self.alpha = alpha
+        self.classes = list(classes)
+        self.word_ids = {} if vocabulary == 'dict' else None
+        self._hash_cache = {}
+        size = n_features if vocabulary == 'hash' else 0
+        self.word_counts = [[0] * size for _ in self.classes]
+        self.total_words = [0] * len(self.classes)
+        self.doc_counts = [0] * len(self.classes)
+        self._log_priors = None
+        self._log_likelihoods = None
+        self._log_odds_table = None
+
+    @classmethod
+    def from_word_lists(cls, spam_words, ham_words, **kwargs):
+        # Seeds a model with the keyword lists the rule-based filters use
+        model = cls(**kwargs)
+        model.partial_fit([' '.join(spam_words), ' '.join(ham_words)], [SPAM, HAM])
+        return model
+
+    def _feature_ids(self, email, grow=False):
+        words = email.lower().split()
+        if self.word_ids is None:
+            # Hash ids are memoized; the cache is dropped when it gets big so
+            # memory stays bounded on open-ended vocabularies
+            cache = self._hash_cache
+            if len(cache) > HASH_CACHE_SIZE:
+                cache.clear()
+            n = self.n_features
+            result = []
+            for word in words:
+                i = cache.get(word)
+                if i is None:
+                    i = cache[word] = zlib.crc32(word.encode('utf-8')) % n
+                result.append(i)
+            return result
+        ids = self.word_ids
+        if not grow:
+            return [ids[word] for word in words if word in ids]
+        result = []
+        for word in words:
+            i = ids.get(word)
+            if i is None:
+                i = ids[word] = len(ids)
+                for counts in self.word_counts:
+                    counts.append(0)
+            result.append(i)
+        return result
+
+    def partial_fit(self, emails, labels):
+        for email, label in zip(emails, labels):
+            if label not in self.classes:
+                self.classes.append(label)
+                self.word_counts.append([0] * len(self.word_counts[0]))
+                self.total_words.append(0)
+                self.doc_counts.append(0)
+            c = self.classes.index(label)
+            counts = self.word_counts[c]
+            ids = self._feature_ids(email, grow=True)
+            for i in ids:
+                counts[i] += 1
+            self.total_words[c] += len(ids)
+            self.doc_counts[c] += 1
+        self._log_priors = None
+        self._log_odds_table = None
+        return self
+
+    def _tables(self):
+        if self._log_priors is None:
+            docs = sum(self.doc_counts)
+            vocab_size = max(1, len(self.word_counts[0]))
+            self._log_priors = [math.log((d + self.alpha) / (docs + self.alpha * len(self.classes)))
+                                for d in self.doc_counts]
+            self._log_likelihoods = []
+            for counts, total in zip(self.word_counts, self.total_words):
+                denominator = math.log(total + self.alpha * vocab_size)
+                self._log_likelihoods.append([math.log(x + self.alpha) - denominator for x in counts])
+        return self._log_priors, self._log_likelihoods
+
+    def log_scores(self, email):
+        priors, likelihoods = self._tables()
+        ids = self._feature_ids(email)
+        return [prior + sum(map(table.__getitem__, ids)) for prior, table in zip(priors, likelihoods)]
+
+    def classify(self, email):
+        if len(self.classes) == 2:
+            # Two classes only need the sign of one log-odds sum
+            prior, delta = self._log_odds()
+            odds = prior + sum(map(delta.__getitem__, self._feature_ids(email)))
+            return self.classes[1] if odds > 0 else self.classes[0]
+        scores = self.log_scores(email)
+        return self.classes[scores.index(max(scores))]
+
+    def _log_odds(self):
+        priors, likelihoods = self._tables()
+        if self._log_odds_table is None:
+            self._log_odds_table = (priors[1] - priors[0],
+                                    [b - a for a, b in zip(likelihoods[0], likelihoods[1])])
+        return self._log_odds_table
+
+    def classify_many(self, emails):
+        return [self.classify(email) for email in emails]
+
+    def classify_batch(self, emails, chunk_size=10000, workers=None):
+        # Lazily scores an iterator of emails in chunks, yielding labels in
+        # input order. With more than one worker the chunks are spread over
+        # a process pool; the model is sent to each worker once. At most
+        # 2 * workers chunks are in flight (Pool.imap would drain the whole
+        # iterator up front), so memory stays bounded on endless streams.
+        workers = workers or os.cpu_count() or 1
+        self._tables()
+        if len(self.classes) == 2:
+            self._log_odds()
+        emails = iter(emails)
+        chunks = iter(lambda: list(islice(emails, chunk_size)), [])
+        if workers == 1:
+            for chunk in chunks:
+                yield from self.classify_many(chunk)
+            return
+        with Pool(workers, initializer=_init_worker, initargs=(self,)) as pool:
+            pending = deque()
+            for chunk in chunks:
+                pending.append(pool.apply_async(_classify_chunk, (chunk,)))
+                if len(pending) >= 2 * workers:
+                    yield from pending.popleft().get()
+            while pending:
+                yield from pending.popleft().get()
+
+
+_worker_model = None
+
+
+def _init_worker(model):
+    global _worker_model
+    _worker_model = model
+
+
+def _classify_chunk(chunk):
+    return _worker_model.classify_many(chunk)
+
+
+def self_check(workers=2, chunk_size=100):
+    # classify_batch must pull emails from an endless stream only as far as
+    # the labels consumed so far, plus the chunks in flight
+    model = MultinomialNaiveBayes.from_word_lists(["buy", "cheap", "discount"], ["meeting", "project", "schedule"])
+    pulled = [0]
+
+    def stream():
+        for i in count():
+            pulled[0] += 1
+            yield "cheap discount now" if i % 2 else "project meeting today"
+
+    batch = model.classify_batch(stream(), chunk_size=chunk_size, workers=workers)
+    labels = list(islice(batch, 1000))
+    batch.close()
+    if labels != [HAM, SPAM] * 500:
+        raise AssertionError("classify_batch labels differ from classify")
+    if pulled[0] > 1000 + (2 * workers + 1) * chunk_size:
+        raise AssertionError(f"classify_batch pulled {pulled[0]} emails for 1000 labels")
+
+
+# Benchmark: messages/sec against the rule-based filters
+
+
+def generate_emails(n, seed=0):
+    import random
+    rng = random.Random(seed)
+    spam_vocab = ["buy", "cheap", "discount", "offer", "winner", "free", "click", "deal"]
+    ham_vocab = ["meeting", "project", "schedule", "report", "review", "team", "lunch", "agenda"]
+    common = ["the", "a", "to", "and", "of", "now", "please", "today", "your", "for"]
+    emails = []
+    labels = []
+    for _ in range(n):
+        spam = rng.random() < 0.4
+        topic = spam_vocab if spam else ham_vocab
+        words = [rng.choice(topic if rng.random() < 0.3 else common) for _ in range(rng.randint(8, 40))]
+        emails.append(' '.join(words))
+        labels.append(SPAM if spam else HAM)
+    return emails, labels
+
+
+def benchmark(n=100000, workers=None):
+    from algorithms import spam_filter_using_naive_bayes, spam_filter_using_svm
+    spam_words = ["buy", "cheap", "discount"]
+    ham_words = ["meeting", "project", "schedule"]
+    train, train_labels = generate_emails(20000, seed=1)
+    emails, labels = generate_emails(n, seed=2)
+    model = MultinomialNaiveBayes().partial_fit(train, train_labels)
+
+    def accuracy(predicted):
+        return sum(p == y for p, y in zip(predicted, labels)) / n
+
+    runs = [
+        ('spam_filter_using_naive_bayes', lambda: [spam_filter_using_naive_bayes(e, spam_words, ham_words) for e in emails]),
+        ('spam_filter_using_svm', lambda: [spam_filter_using_svm(e, spam_words) for e in emails]),
+        ('MultinomialNaiveBayes.classify_many', lambda: model.classify_many(emails)),
+        ('MultinomialNaiveBayes.classify_batch', lambda: list(model.classify_batch(iter(emails), workers=workers))),
+    ]
+    results = []
+    for name, run in runs:
+        t0 = time.perf_counter()
+        predicted = run()
+        elapsed = time.perf_counter() - t0
+        results.append((name, n / elapsed, accuracy(predicted)))
+    return results
+
+
+if __name__ == "__main__":
+    self_check()
+    print("classify_batch streams lazily")
+    model = MultinomialNaiveBayes.from_word_lists(["buy", "cheap", "discount"], ["meeting", "project", "schedule"])
+    print("Naive Bayes Email1:", model.classify("Get a cheap discount now"))
+    print("Naive Bayes Email2:", model.classify("Let's schedule a project meeting"))
+
+    print(f"{'classifier':<40}{'messages/s':>14}{'accuracy':>10}")
+    for name, rate, acc in benchmark():
+        print(f"{name:<40}{rate:>14,.0f}{acc:>10.3f}")
@@ -0,0 +1,177 @@
+import argparse
+import hashlib
+import os
+import re
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from fnmatch import fnmatch
+
+from dfa_lexer import spec_hash
+from main import LEXER, TOKEN_TYPES
+from token_stream import TokenStream
+
+# Batch lexing
+#
+# lex_files(paths) lexes every file under the given files and directories:
+#   - each file is read and hashed (SHA-256 of its bytes); a file whose hash
+#     is already in the cache is not lexed again
+#   - the text of each remaining file, as read and hashed here, is fanned out
+#     to a process pool; workers return the token stream packed with
+#     TokenStream.to_bytes(), which is cached under the hash of exactly that
+#     text's bytes, so a file changing meanwhile can never mismatch its entry
+#   - cache entries live in cache_dir/<spec>/<content hash>.tok, where spec
+#     hashes TOKEN_TYPES and the flags, so changing the lexer spec never
+#     reuses old tokens
+# Sources are read like open(path).read() (UTF-8, universal newlines), and
+# results are TokenStreams over them. A file that cannot be read or is not
+# valid UTF-8 is skipped and listed in stats['errors'] (path -> message)
+# instead of aborting the batch. Returns the results by path and the
+# counters behind the report: files/s, tokens/s, cache hit rate and failures.
+
+SPEC = spec_hash(TOKEN_TYPES, re.IGNORECASE)[:16]
+
+
+def collect(paths, pattern='*'):
+    files = []
+    for path in paths:
+        if os.path.isdir(path):
+            for root, dirs, names in os.walk(path):
+                dirs.sort()
+                files += [os.path.join(root, name) for name in sorted(names) if fnmatch(name, pattern)]
+        else:
+            files.append(path)
+    return files
+
+
+def read_source(path):
+    with open(path, 'rb') as file:
+        data = file.read()
+    text = data.decode('utf-8').replace('\r\n', '\n').replace('\r', '\n')
+    return hashlib.sha256(data).hexdigest(), text
+
+
+def _lex_text(text):
+    # Worker: packed tokens for one source
+    return TokenStream.from_source(text).to_bytes()
+
+
+def _cache_path(cache_dir, digest):
+    return os.path.join(cache_dir, SPEC, digest + '.tok')
+
+
+def lex_files(paths, workers=None, cache_dir=None, pattern='*'):
+    t0 = time.perf_counter()
+    files = collect(paths, pattern)
+    sources = {}
+    results = {}
+    errors = {}
+    misses = []
+    for path in files:
+        try:
+            digest, text = read_source(path)
+        except (OSError, UnicodeDecodeError) as error:
+            errors[path] = str(error)
+            continue
+        sources[path] = (digest, text)
+        if cache_dir is not None:
+            try:
+                with open(_cache_path(cache_dir, digest), 'rb') as file:
+                    results[path] = TokenStream.from_bytes(file.read(), text)
+                continue
+            except (OSError, ValueError):
+                pass
+        misses.append(path)
+    hits = len(sources) - len(misses)
+
+    texts = [sources[path][1] for path in misses]
+    if workers == 1 or len(misses) < 2:
+        packed = map(_lex_text, texts)
+        pool = None
+    else:
+        pool = ProcessPoolExecutor(workers)
+        chunksize = max(1, len(misses) // (4 * (workers or os.cpu_count() or 1)))
+        packed = pool.map(_lex_text, texts, chunksize=chunksize)
+    try:
+        for path, data in zip(misses, packed):
+            digest, text = sources[path]
+            results[path] = TokenStream.from_bytes(data, text)
+            if cache_dir is not None:
+                target = _cache_path(cache_dir, digest)
+                os.makedirs(os.path.dirname(target), exist_ok=True)
+                temporary = f"{target}.{os.getpid()}.tmp"
+                with open(temporary, 'wb') as file:
+                    file.write(data)
+                os.replace(temporary, target)
+    finally:
+        if pool is not None:
+            pool.shutdown()
+
+    stats = {
+        'files': len(files),
+        'tokens': sum(len(stream) for stream in results.values()),
+        'characters': sum(len(text) for _, text in sources.values()),
+        'cache_hits': hits,
+        'errors': errors,
+        'seconds': time.perf_counter() - t0,
+    }
+    return results, stats
+
+
+def report(stats):
+    seconds = stats['seconds'] or 1e-9
+    lexed = stats['files'] - len(stats['errors'])
+    hit_rate = stats['cache_hits'] / lexed if lexed else 0.0
+    return (f"{stats['files']:,} files, {stats['tokens']:,} tokens in {seconds:.2f}s: "
+            f"{stats['files'] / seconds:,.0f} files/s, {stats['tokens'] / seconds:,.0f} tokens/s, "
+            f"cache hit rate {hit_rate:.0%}, {len(stats['errors']):,} failed")
+
+
+def self_check():
+    # One file that is not UTF-8 among good ones: the others are still lexed,
+    # with and without workers and cache, and the bad one is reported
+    with tempfile.TemporaryDirectory() as root:
+        good = ['let x = 1;\n', 'print(x) /* note */ y\n', '"s" + 2.5\r\n'] * 4
+        for i, text in enumerate(good):
+            with open(os.path.join(root, f'{i:02}.src'), 'w', newline='') as file:
+                file.write(text)
+        bad = os.path.join(root, 'bad.src')
+        with open(bad, 'wb') as file:
+            file.write(b'let \xff = 1;\n')
+        cache = os.path.join(root, 'cache')
+        for workers in (1, 2, 2):
+            results, stats = lex_files([root], workers, cache, '*.src')
+            if list(stats['errors']) != [bad] or len(results) != len(good):
+                raise AssertionError(f"bad file not isolated with {workers} workers")
+            for stream in results.values():
+                if list(stream) != LEXER.tokenize(stream.source):
+                    raise AssertionError("tokens differ from tokenize()")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Lex many source files in parallel with a token cache")
+    parser.add_argument('paths', nargs='+', help="files and directories to lex")
+    parser.add_argument('--pattern', default='*', help="file name pattern inside directories")
+    parser.add_argument('--workers', type=int, default=None, help="worker processes (1 lexes in-process)")
+    parser.add_argument('--cache', default=None, help="cache directory (no cache when omitted)")
+    parser.add_argument('--check', action='store_true', help="compare every result with tokenize()")
+    args = parser.parse_args(argv)
+    results, stats = lex_files(args.paths, args.workers, args.cache, args.pattern)
+    for path, message in stats['errors'].items():
+        print(f"{path}: {message}", file=sys.stderr)
+    if args.check:
+        for path, stream in results.items():
+            if list(stream) != LEXER.tokenize(stream.source):
+                print(f"{path}: tokens differ from tokenize()")
+                return 1
+    print(report(stats))
+    return 1 if stats['errors'] else 0
+
+
+if __name__ == "__main__":
+    if sys.argv[1:] == ['--self-check']:
+        self_check()
+        print("Bad files are isolated")
+    else:
+        sys.exit(main())
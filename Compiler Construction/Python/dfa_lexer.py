@@ -0,0 +1,536 @@
+import hashlib
+import json
+import os
+import random
+import re
+import sys
+import time
+from array import array
+
+from lexer import UNEXPECTED, is_word_char
+
+# Table-driven DFA lexer
+#
+# build_table(token_types) turns a TOKEN_TYPES-style spec into one minimized
+# DFA over character classes:
+#   - each pattern is parsed into a small regex AST (literals, escapes,
+#     classes, '.', groups, |, *, +, ?, {n}, {n,m}) and compiled to an NFA;
+#     \b is allowed at the start of a pattern (ignored: a token starts where
+#     the previous one ended) or at its end, where it becomes a check that no
+#     word character follows the token
+#   - a last alternative that runs to the end of the input, such as the
+#     unterminated /\*(.|\n)* of COMMENT, is split off: it accepts only at
+#     the end of the input and only when no earlier alternative of the same
+#     pattern matched, as in the regex, where it is tried only after the
+#     others failed
+#   - the alphabet is split into classes of characters that every atom of
+#     the spec treats alike; membership is decided by re itself (with the
+#     spec's flags), so IGNORECASE folds non-ASCII characters such as 'ſ'
+#     and 'K' exactly as the regex lexer does
+#   - subset construction gives the DFA, and Moore's partition refinement
+#     minimizes it
+# Scanning is maximal munch: the longest match wins, and among patterns
+# accepting the same length the earliest in the list wins (so keywords beat
+# IDENTIFIER). This differs from tokenize(), which takes the first pattern
+# that matches at all, in one place of TOKEN_TYPES: '=>' is a DICTIONARY_OP
+# instead of '=' followed by '>'. A /* comment runs to the last */ in the
+# input, or to its end when there is none, as in tokenize().
+#
+# The table is a flat array('I') of row offsets (state * class count), so
+# the loop does one index and one add per character over the source
+# translated to class ids. DFALexer.save()/load() store it as JSON together
+# with a hash of the spec; cached(token_types, path) loads it when the spec
+# still matches and rebuilds and saves it otherwise.
+
+FORMAT_VERSION = 2
+
+
+# Regex parsing
+
+
+class _Parser:
+    def __init__(self, pattern):
+        self.pattern = pattern
+        self.pos = 0
+
+    def parse(self):
+        node = self.alternation()
+        if self.pos != len(self.pattern):
+            raise ValueError(f"unbalanced ')' in {self.pattern!r}")
+        return node
+
+    def peek(self):
+        return self.pattern[self.pos] if self.pos < len(self.pattern) else None
+
+    def alternation(self):
+        branches = [self.concatenation()]
+        while self.peek() == '|':
+            self.pos += 1
+            branches.append(self.concatenation())
+        return branches[0] if len(branches) == 1 else ('alt', branches)
+
+    def concatenation(self):
+        items = []
+        while self.peek() not in (None, '|', ')'):
+            items.append(self.repeat())
+        return ('cat', items)
+
+    def repeat(self):
+        node = self.atom()
+        while self.peek() in ('*', '+', '?', '{'):
+            c = self.peek()
+            self.pos += 1
+            if c == '*':
+                node = ('star', node)
+            elif c == '+':
+                node = ('cat', [node, ('star', node)])
+            elif c == '?':
+                node = ('alt', [node, ('cat', [])])
+            else:
+                end = self.pattern.index('}', self.pos)
+                low, comma, high = self.pattern[self.pos:end].partition(',')
+                self.pos = end + 1
+                low = int(low)
+                high = low if not comma else (int(high) if high else None)
+                items = [node] * low
+                if high is None:
+                    items.append(('star', node))
+                else:
+                    items += [('alt', [node, ('cat', [])])] * (high - low)
+                node = ('cat', items)
+        return node
+
+    def atom(self):
+        pattern = self.pattern
+        start = self.pos
+        c = pattern[start]
+        if c == '(':
+            self.pos += 1
+            if pattern.startswith('?:', self.pos):
+                self.pos += 2
+            elif self.peek() == '?':
+                raise ValueError(f"unsupported group in {pattern!r}")
+            node = self.alternation()
+            if self.peek() != ')':
+                raise ValueError(f"missing ')' in {pattern!r}")
+            self.pos += 1
+            return node
+        if c == '[':
+            pos = start + 1
+            if pattern.startswith('^', pos):
+                pos += 1
+            if pattern.startswith(']', pos):
+                pos += 1
+            while pattern[pos] != ']':
+                pos += 2 if pattern[pos] == '\\' else 1
+            self.pos = pos + 1
+            return ('atom', pattern[start:self.pos])
+        if c == '\\':
+            self.pos += 2
+            if pattern[start + 1] == 'b':
+                return ('boundary',)
+            return ('atom', pattern[start:self.pos])
+        if c in '*+?{':
+            raise ValueError(f"nothing to repeat in {pattern!r}")
+        self.pos += 1
+        return ('atom', '.' if c == '.' else re.escape(c))
+
+
+def parse_pattern(pattern):
+    # Returns (ast, boundary, rest) with the pattern's leading/trailing \b
+    # removed; rest is a last alternative running to the end of the input,
+    # split off from ast, or None
+    node = _Parser(pattern).parse()
+    items = node[1] if node[0] == 'cat' else [node]
+    boundary = False
+    if items and items[0] == ('boundary',):
+        items = items[1:]
+    if items and items[-1] == ('boundary',):
+        items = items[:-1]
+        boundary = True
+    rest = None
+    if len(items) == 1 and items[0][0] == 'alt' and len(items[0][1]) > 1 and _runs_to_end(items[0][1][-1]):
+        rest = items[0][1][-1]
+        items = [('alt', items[0][1][:-1])]
+    node = ('cat', items)
+    if _has_boundary(node) or (rest is not None and _has_boundary(rest)):
+        raise ValueError(f"\\b is only supported at the start or end of {pattern!r}")
+    return node, boundary, rest
+
+
+def _runs_to_end(node):
+    # True when node ends in a star of atoms that together match every
+    # character, like (.|\n)*
+    items = node[1] if node[0] == 'cat' else [node]
+    if not items or items[-1][0] != 'star':
+        return False
+    inner = items[-1][1]
+    atoms = []
+    for branch in inner[1] if inner[0] == 'alt' else [inner]:
+        if branch[0] == 'cat' and len(branch[1]) == 1:
+            branch = branch[1][0]
+        if branch[0] != 'atom':
+            return False
+        atoms.append(branch[1])
+    return '.' in atoms and any(re.fullmatch(atom, '\n') for atom in atoms)
+
+
+def _has_boundary(node):
+    if node[0] == 'boundary':
+        return True
+    if node[0] in ('cat', 'alt'):
+        return any(_has_boundary(item) for item in node[1])
+    if node[0] == 'star':
+        return _has_boundary(node[1])
+    return False
+
+
+# NFA (Thompson construction over atoms)
+
+
+class _NFA:
+    def __init__(self):
+        self.eps = []
+        self.moves = []
+        self.atoms = {}
+
+    def state(self):
+        self.eps.append([])
+        self.moves.append([])
+        return len(self.eps) - 1
+
+    def add(self, node):
+        # Returns (start, end) of the fragment for node
+        kind = node[0]
+        if kind == 'atom':
+            start, end = self.state(), self.state()
+            atom = self.atoms.setdefault(node[1], len(self.atoms))
+            self.moves[start].append((atom, end))
+            return start, end
+        if kind == 'cat':
+            start = end = self.state()
+            for item in node[1]:
+                s, e = self.add(item)
+                self.eps[end].append(s)
+                end = e
+            return start, end
+        if kind == 'alt':
+            start, end = self.state(), self.state()
+            for item in node[1]:
+                s, e = self.add(item)
+                self.eps[start].append(s)
+                self.eps[e].append(end)
+            return start, end
+        if kind == 'star':
+            start, end = self.state(), self.state()
+            s, e = self.add(node[1])
+            self.eps[start] += [s, end]
+            self.eps[e] += [s, end]
+            return start, end
+        raise ValueError(f"unexpected regex node {kind}")
+
+    def closure(self, states):
+        stack = list(states)
+        seen = set(states)
+        while stack:
+            for t in self.eps[stack.pop()]:
+                if t not in seen:
+                    seen.add(t)
+                    stack.append(t)
+        return frozenset(seen)
+
+
+# Character classes
+
+
+def character_classes(atoms, flags):
+    # Returns (class of each ASCII code, {non-ASCII char: class}, class of
+    # every other character, set of classes matched by each atom)
+    compiled = [re.compile(atom, flags) for atom in atoms]
+    positive = ['[' + atom[2:] if atom.startswith('[^') else atom for atom in atoms if atom != '.']
+    everything = ''.join(map(chr, range(128, sys.maxunicode + 1)))
+    special = set(re.findall('|'.join(f'(?:{atom})' for atom in positive), everything, flags)) if positive else set()
+    other = next(chr(i) for i in range(128, sys.maxunicode + 1) if chr(i) not in special)
+    representatives = [chr(i) for i in range(128)] + sorted(special) + [other]
+    ids = {}
+    class_of = {}
+    for c in representatives:
+        signature = tuple(bool(pattern.fullmatch(c)) for pattern in compiled)
+        class_of[c] = ids.setdefault(signature, len(ids))
+    atom_classes = [set() for _ in atoms]
+    for signature, cls in ids.items():
+        for atom, matches in enumerate(signature):
+            if matches:
+                atom_classes[atom].add(cls)
+    other_class = class_of[other]
+    ascii_classes = [class_of[chr(i)] for i in range(128)]
+    special_classes = {c: class_of[c] for c in sorted(special) if class_of[c] != other_class}
+    return ascii_classes, special_classes, other_class, len(ids), atom_classes
+
+
+# DFA construction and minimization
+
+
+def build_table(token_types, flags=re.IGNORECASE):
+    token_types = list(token_types)
+    nfa = _NFA()
+    start = nfa.state()
+    finals = {}
+    for priority, (name, pattern) in enumerate(token_types):
+        node, boundary, rest = parse_pattern(pattern)
+        for branch, at_end in ((node, False), (rest, True)):
+            if branch is not None:
+                s, e = nfa.add(branch)
+                nfa.eps[start].append(s)
+                finals[e] = (priority, boundary, at_end)
+    atoms = sorted(nfa.atoms, key=nfa.atoms.get)
+    ascii_classes, special_classes, other_class, n_classes, atom_classes = character_classes(atoms, flags)
+
+    # Subset construction; DFA state 0 is the dead state
+    moves = [[(atom_classes[atom], target) for atom, target in edges] for edges in nfa.moves]
+    dead = frozenset()
+    initial = nfa.closure([start])
+    index = {dead: 0, initial: 1}
+    sets = [dead, initial]
+    delta = []
+    for states in sets:
+        row = []
+        for cls in range(n_classes):
+            targets = [t for s in states for classes, t in moves[s] if cls in classes]
+            target = nfa.closure(targets) if targets else dead
+            if target not in index:
+                index[target] = len(sets)
+                sets.append(target)
+            row.append(index[target])
+        delta.append(row)
+    accepts = []
+    for states in sets:
+        entries = sorted(finals[s] for s in states if s in finals)
+        kept = []
+        for priority, boundary, at_end in entries:
+            kept.append((priority, boundary, at_end))
+            if not boundary and not at_end:
+                # Later patterns can never be chosen over this one
+                break
+        accepts.append(tuple(kept))
+
+    # Moore minimization: split by accepted patterns, then by successors
+    block = {}
+    partition = [block.setdefault(accept, len(block)) for accept in accepts]
+    partition[0] = -1
+    while True:
+        keys = {}
+        refined = [keys.setdefault((partition[s], tuple(partition[t] for t in delta[s])), len(keys))
+                   for s in range(len(sets))]
+        if len(keys) == len(set(partition)):
+            break
+        partition = refined
+    # Renumber: dead state 0, start state 1
+    order = {partition[0]: 0, partition[1]: 1}
+    for s in range(len(sets)):
+        order.setdefault(partition[s], len(order))
+    n_states = len(order)
+    table = array('I', bytes(4 * n_states * n_classes))
+    accept_table = [None] * n_states
+    for s in range(len(sets)):
+        state = order[partition[s]]
+        for cls, t in enumerate(delta[s]):
+            table[state * n_classes + cls] = order[partition[t]] * n_classes
+        accept_table[state] = [list(entry) for entry in accepts[s]] or None
+    return {
+        'version': FORMAT_VERSION,
+        'spec': spec_hash(token_types, flags),
+        'names': [name for name, _ in token_types],
+        'classes': n_classes,
+        'ascii': ascii_classes,
+        'special': special_classes,
+        'other': other_class,
+        'start': n_classes,
+        'delta': table,
+        'accepts': accept_table,
+    }
+
+
+def spec_hash(token_types, flags):
+    return hashlib.sha256(json.dumps([list(map(list, token_types)), int(flags)]).encode()).hexdigest()
+
+
+# Scanner
+
+
+class _Classes(dict):
+    # str.translate mapping: characters not listed get the "other" class
+    def __init__(self, mapping, other):
+        super().__init__(mapping)
+        self.other = other
+
+    def __missing__(self, key):
+        return self.other
+
+
+class DFALexer:
+    def __init__(self, table, newline='NEW_LINE', skip=('SPACE',), comments=('COMMENT',),
+                 escaped_newlines=('STRING_DATATYPE',)):
+        self.table = table
+        self.names = table['names']
+        self.newline = newline
+        self.skip = frozenset(skip)
+        self.comments = frozenset(comments)
+        self.escaped_newlines = frozenset(escaped_newlines)
+        n_classes = table['classes']
+        self._delta = table['delta']
+        self._start = table['start']
+        # Accepting entries by row offset: (name, needs a word boundary, only
+        # at the end of the input)
+        self._accepts = [None] * len(self._delta)
+        for state, entries in enumerate(table['accepts']):
+            if entries:
+                self._accepts[state * n_classes] = tuple((self.names[p], b, e) for p, b, e in entries)
+        mapping = {i: chr(cls) for i, cls in enumerate(table['ascii'])}
+        mapping.update((ord(c), chr(cls)) for c, cls in table['special'].items())
+        self._translate = _Classes(mapping, chr(table['other']))
+
+    @classmethod
+    def from_spec(cls, token_types, flags=re.IGNORECASE, **options):
+        return cls(build_table(token_types, flags), **options)
+
+    def save(self, path):
+        data = dict(self.table, delta=self.table['delta'].tolist())
+        with open(path, 'w') as file:
+            json.dump(data, file)
+
+    @classmethod
+    def load(cls, path, **options):
+        with open(path) as file:
+            table = json.load(file)
+        if table.get('version') != FORMAT_VERSION:
+            raise ValueError(f"{path} holds a table in an unsupported format")
+        table['delta'] = array('I', table['delta'])
+        return cls(table, **options)
+
+    def spans(self, source, pos=0, line=1):
+        # Same contract as Lexer.spans: (kind, start, end, line) per emitted token
+        classes = source.translate(self._translate).encode('latin-1')
+        delta = self._delta
+        accepts = self._accepts
+        start_row = self._start
+        newline = self.newline
+        skip = self.skip
+        comments = self.comments
+        escaped = self.escaped_newlines
+        n = len(source)
+        while pos < n:
+            row = start_row
+            i = pos
+            end = -1
+            kind = None
+            while i < n:
+                row = delta[row + classes[i]]
+                if not row:
+                    break
+                i += 1
+                entries = accepts[row]
+                if entries is not None:
+                    for name, boundary, at_end in entries:
+                        if at_end:
+                            # The pattern's other alternatives came first
+                            if i < n or kind == name:
+                                continue
+                        elif boundary and i < n and is_word_char(source[i]):
+                            continue
+                        end = i
+                        kind = name
+                        break
+            if kind is None:
+                yield UNEXPECTED, pos, pos + 1, line
+                pos += 1
+                continue
+            if kind in skip:
+                pass
+            elif kind == newline:
+                line += 1
+            elif kind in comments:
+                line += source.count('\n', pos, end)
+            else:
+                yield kind, pos, end, line
+                if kind in escaped:
+                    line += source.count('\\n', pos, end)
+            pos = end
+        return line
+
+    def tokenize(self, source):
+        return [(kind, source[start:end], line) for kind, start, end, line in self.spans(source)]
+
+
+def cached(token_types, path, flags=re.IGNORECASE, **options):
+    # Loads the table from path, rebuilding (and saving) it when missing or
+    # built from a different spec
+    if os.path.exists(path):
+        try:
+            lexer = DFALexer.load(path, **options)
+            if lexer.table['spec'] == spec_hash(token_types, flags):
+                return lexer
+        except (ValueError, KeyError):
+            pass
+    lexer = DFALexer.from_spec(token_types, flags, **options)
+    lexer.save(path)
+    return lexer
+
+
+# Self-check and benchmark
+
+
+def self_check(lexer, rounds=3000, seed=0):
+    from main import tokenize
+    # Sources with '=>' are skipped: there maximal munch differs from
+    # tokenize()
+    pieces = ['else', 'if', 'elif', 'elseif', 'ELSE', ' ', '\n', '\t', 'null', 'true', 'False', 'Main', 'ſtatic',
+              'Kelvin', 'ıf', 'İf', 'é', '_', 'x', 'a1', '1', '0.5', '.', '.5', '"', "'", '\\n', '*/', '//', '/', '*',
+              '**', '=', '==', '===', '!', '!=', '<', '+', '++', '-', '--', '&&', '||', ':', ';', ',', '(', ')',
+              '{', '}', '[', ']', '%', '@', '>', '>=', 'int', 'print', 'range', 'public', '\r', 'ß', '1null', '\xa0']
+    rng = random.Random(seed)
+    for _ in range(rounds):
+        source = ''.join(rng.choice(pieces) for _ in range(rng.randint(0, 60)))
+        if '=>' in source:
+            continue
+        if lexer.tokenize(source) != tokenize(source):
+            raise AssertionError(f"DFA lexer differs from tokenize on {source!r}")
+    # Block comments followed by more code, closed or not
+    for source in ('let a = 1; /* note */ print(a);\n/* two\nlines */ x = 2\n',
+                   '/* a */ b /* c */ d', 'x = 1 /* open\ny = 2', '/**/x', '/*/ x', '/*', 'a /* b */'):
+        if lexer.tokenize(source) != tokenize(source):
+            raise AssertionError(f"DFA lexer differs from tokenize on {source!r}")
+
+
+def benchmark(lexer, path="mySourceCode.txt", size=2000000):
+    from main import tokenize
+    with open(path) as file:
+        unit = file.read().replace('/*', '//')
+    source = unit * max(1, size // len(unit))
+    results = []
+    for name, run in (('tokenize (regex)', tokenize), ('DFA lexer', lexer.tokenize)):
+        t0 = time.perf_counter()
+        tokens = run(source)
+        results.append((name, len(tokens), time.perf_counter() - t0))
+    return len(source), results
+
+
+if __name__ == "__main__":
+    from main import TOKEN_TYPES
+    t0 = time.perf_counter()
+    lexer = DFALexer.from_spec(TOKEN_TYPES)
+    build = time.perf_counter() - t0
+    path = "token_table.json"
+    lexer.save(path)
+    t0 = time.perf_counter()
+    lexer = cached(TOKEN_TYPES, path)
+    load = time.perf_counter() - t0
+    os.remove(path)
+    print(f"{len(lexer.table['accepts'])} states x {lexer.table['classes']} classes: "
+          f"built in {build:.2f}s, loaded in {load * 1e3:.1f}ms")
+    print(lexer.tokenize('let d = {a => 1}; /* note\n*/ x'))
+    self_check(lexer)
+    print("Self-check passed")
+    chars, results = benchmark(lexer)
+    for name, count, seconds in results:
+        print(f"{name:<20}{count:>10,} tokens{chars / seconds / 1e6:>8.2f} MB/s")
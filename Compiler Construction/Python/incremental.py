@@ -0,0 +1,234 @@
+import random
+import time
+from bisect import bisect_right
+from itertools import islice
+
+from lexer import UNEXPECTED
+from main import LEXER, tokenize
+
+# Incremental re-lexing
+#
+# IncrementalLexer(source) keeps every token of the source with its offsets
+# and line, including the SPACE, NEW_LINE and COMMENT tokens tokenize() drops
+# (together they tile the source). edit(start, old_len, new_text) replaces
+# source[start:start + old_len] and re-lexes from a token the edit cannot
+# have affected:
+#   - a match examines at most two characters past its end (INT before '.5',
+#     '==' before '='), so lexing restarts at the token containing start - 2,
+#     moved back over whitespace and one more token (else\s*if)
+#   - the two matches that look arbitrarily far ahead move it further back:
+#     an unmatched quote, when the new text contains that quote, and a /*
+#     comment, which runs to the last */ of the source
+# Lexing from a position depends only on the text after it, so once a new
+# token starts past the edit exactly where an old token started, the rest of
+# the old stream is kept, shifted by the change in length and in lines.
+# Tokens are stored in blocks with offsets and lines relative to the block,
+# so that shift costs one addition per block rather than one per token.
+# Edits that re-pair quotes (deleting or typing a quote) change every string
+# after them and re-lex to the end, as tokenize() would.
+
+# Block layout
+OFFSET, LINE, KINDS, STARTS, ENDS, LINES, MARKS = range(7)
+
+
+class IncrementalLexer:
+    def __init__(self, source, lexer=LEXER, block_size=256):
+        self.lexer = lexer
+        self.block_size = block_size
+        self.source = source
+        self._blocks = self._build(list(lexer.spans(source, 0, 1, drop=False)))
+        self._bases = [block[OFFSET] for block in self._blocks]
+
+    def __iter__(self):
+        source = self.source
+        dropped = self.lexer.dropped
+        for _, (kind, start, end, line) in self._absolute(0):
+            if kind not in dropped:
+                yield kind, source[start:end], line
+
+    def tokens(self):
+        return list(self)
+
+    def _build(self, tokens):
+        # Blocks of (kind, start, end, line) tokens; MARKS holds the quotes
+        # left unmatched and the /* of comments inside the block
+        source = self.source
+        quotes = self.lexer.quotes
+        comments = self.lexer.comments
+        opening = self.lexer.block_comment[0]
+        blocks = []
+        for i in range(0, len(tokens), self.block_size):
+            part = tokens[i:i + self.block_size]
+            offset = part[0][1]
+            line = part[0][3]
+            marks = set()
+            for kind, start, _, _ in part:
+                if kind == UNEXPECTED and source[start] in quotes:
+                    marks.add(source[start])
+                elif kind in comments and source.startswith(opening, start):
+                    marks.add(opening)
+            blocks.append([offset, line,
+                           [token[0] for token in part],
+                           [token[1] - offset for token in part],
+                           [token[2] - offset for token in part],
+                           [token[3] - line for token in part],
+                           marks])
+        return blocks
+
+    def _absolute(self, b, j=0):
+        # ((block, index), (kind, start, end, line)) from token j of block b on
+        for bi, block in enumerate(islice(self._blocks, b, None), b):
+            offset, line, kinds, starts, ends, lines, _ = block
+            for k in range(j, len(kinds)):
+                yield (bi, k), (kinds[k], offset + starts[k], offset + ends[k], line + lines[k])
+            j = 0
+
+    def _locate(self, pos):
+        # (block, index) of the token containing pos
+        b = bisect_right(self._bases, pos) - 1
+        block = self._blocks[b]
+        return b, bisect_right(block[STARTS], pos - block[OFFSET]) - 1
+
+    def _first_at(self, pos):
+        # (block, index) of the first token starting at or after pos
+        if pos >= len(self.source):
+            return len(self._blocks), 0
+        b, j = self._locate(pos)
+        block = self._blocks[b]
+        if block[OFFSET] + block[STARTS][j] < pos:
+            j += 1
+            if j == len(block[KINDS]):
+                b, j = b + 1, 0
+        return b, j
+
+    def _restart(self, start, new_text):
+        blocks = self._blocks
+        source = self.source
+        b, j = self._locate(max(0, min(start - 2, len(source) - 1)))
+        while b or j:
+            if j:
+                j -= 1
+            else:
+                b -= 1
+                j = len(blocks[b][KINDS]) - 1
+            block = blocks[b]
+            if not source[block[OFFSET] + block[STARTS][j]:block[OFFSET] + block[ENDS][j]].isspace():
+                break
+        wanted = {quote for quote in self.lexer.quotes if quote in new_text}
+        wanted.add(self.lexer.block_comment[0])
+        for bi in range(b + 1):
+            if blocks[bi][MARKS] & wanted:
+                block = blocks[bi]
+                for k in range(len(block[KINDS]) if bi < b else j):
+                    kind = block[KINDS][k]
+                    pos = block[OFFSET] + block[STARTS][k]
+                    if kind == UNEXPECTED and source[pos] in wanted:
+                        return bi, k
+                    if kind in self.lexer.comments and source.startswith(self.lexer.block_comment[0], pos):
+                        return bi, k
+        return b, j
+
+    def edit(self, start, old_len, new_text):
+        # Returns the span of the new source that was re-lexed
+        source = self.source
+        if start < 0 or old_len < 0 or start + old_len > len(source):
+            raise IndexError("edit outside the source")
+        blocks = self._blocks
+        if blocks:
+            b, j = self._restart(start, new_text)
+            pos = blocks[b][OFFSET] + blocks[b][STARTS][j]
+            line = blocks[b][LINE] + blocks[b][LINES][j]
+        else:
+            b, j, pos, line = 0, 0, 0, 1
+        old = self._absolute(*self._first_at(start + old_len))
+        old_token = next(old, None)
+
+        self.source = source = source[:start] + new_text + source[start + old_len:]
+        delta = len(new_text) - old_len
+        edit_end = start + len(new_text)
+        new_tokens = []
+        resync = None
+        for token in self.lexer.spans(source, pos, line, drop=False):
+            if token[1] >= edit_end:
+                target = token[1] - delta
+                while old_token is not None and old_token[1][1] < target:
+                    old_token = next(old, None)
+                if old_token is not None and old_token[1][1] == target:
+                    resync = old_token
+                    break
+            new_tokens.append(token)
+
+        head = [token for _, token in islice(self._absolute(b), j)]
+        if resync is None:
+            tail = []
+            last = len(blocks)
+            relexed = len(source)
+        else:
+            (rb, rj), (_, relexed, _, old_line) = resync
+            relexed += delta
+            dline = token[3] - old_line
+            tail = [(kind, s + delta, e + delta, l + dline)
+                    for _, (kind, s, e, l) in islice(self._absolute(rb, rj), len(blocks[rb][KINDS]) - rj)]
+            last = rb + 1
+            for block in islice(blocks, last, None):
+                block[OFFSET] += delta
+                block[LINE] += dline
+        blocks[b:last] = self._build(head + new_tokens + tail)
+        self._bases = [block[OFFSET] for block in blocks]
+        return pos, relexed
+
+
+# Self-check and benchmark
+
+
+def random_edit(rng, source, pieces):
+    start = rng.randint(0, len(source))
+    old_len = rng.randint(0, min(8, len(source) - start))
+    new_text = ''.join(rng.choice(pieces) for _ in range(rng.randint(0, 3)))
+    return start, old_len, new_text
+
+
+def self_check(rounds=300, edits=20, seed=0):
+    pieces = ['else', 'if', ' ', '\n', '\t', 'x', 'a1', '1', '.5', '.', '"', "'", '\\n', '/*', '*/', '//', '/', '*',
+              '=', '==', '!', '<', '+', ';', '(', 'int', 'null', 'é']
+    rng = random.Random(seed)
+    for _ in range(rounds):
+        source = ''.join(rng.choice(pieces) for _ in range(rng.randint(0, 60)))
+        lexer = IncrementalLexer(source, block_size=rng.randint(1, 8))
+        for _ in range(edits):
+            start, old_len, new_text = random_edit(rng, source, pieces)
+            source = source[:start] + new_text + source[start + old_len:]
+            lexer.edit(start, old_len, new_text)
+            if lexer.source != source or lexer.tokens() != tokenize(source):
+                raise AssertionError(f"incremental tokens differ after editing {source!r}")
+
+
+def benchmark(path="mySourceCode.txt", size=1000000, edits=200, seed=0):
+    with open(path) as file:
+        unit = file.read().replace('/*', '//')
+    source = unit * max(1, size // len(unit))
+    rng = random.Random(seed)
+    t0 = time.perf_counter()
+    tokenize(source)
+    full = time.perf_counter() - t0
+    t0 = time.perf_counter()
+    lexer = IncrementalLexer(source)
+    build = time.perf_counter() - t0
+    t0 = time.perf_counter()
+    for _ in range(edits):
+        # Typing: insertions anywhere in the buffer
+        lexer.edit(rng.randint(0, len(lexer.source)), 0, rng.choice(['x', ' ', '1', '\n', ';', '(', 'if']))
+    per_edit = (time.perf_counter() - t0) / edits
+    if lexer.tokens() != tokenize(lexer.source):
+        raise AssertionError("incremental tokens differ from tokenize")
+    return len(source), full, build, per_edit
+
+
+if __name__ == "__main__":
+    lexer = IncrementalLexer('let x = 1;\nprint(x);\n')
+    print(lexer.edit(8, 1, '"two"'), lexer.tokens())
+    self_check()
+    print("Self-check passed")
+    chars, full, build, per_edit = benchmark()
+    print(f"{chars:,} characters: tokenize {full:.3f}s, initial build {build:.3f}s, "
+          f"{per_edit * 1e3:.3f}ms per edit")
@@ -0,0 +1,211 @@
+import argparse
+import io
+import random
+import sys
+import time
+import tracemalloc
+from collections import defaultdict
+
+from dfa_lexer import DFALexer
+from main import LEXER, TOKEN_TYPES, iter_tokens, tokenize, tokenize_reference
+from token_stream import TokenStream
+
+# Lexer throughput benchmark
+#
+#   generate(size, seed) - a synthetic source of about size characters with
+#       every TOKEN_TYPES category: lines of random tokens drawn from SAMPLES,
+#       some ending in a // comment, and a single /* */ block comment at the
+#       very end (the COMMENT regex is greedy to the last */, so one earlier
+#       would swallow the rest of the corpus); DICTIONARY_OP is left out, as
+#       tokenize() never produces it ('=>' is '=' followed by '>')
+#   run(sizes, engines) - time, MB/s, tokens/s and peak traced memory of each
+#       engine on each size, after checking that it returns the same tokens
+#       as tokenize(); memory is measured in a separate run under
+#       tracemalloc so it does not slow the timed one
+#   profile_types(source) - time per token type: the master regex is matched
+#       again at the start of every token, grouped by the type it produced
+#       (keywords are looked up after an IDENTIFIER match, so they share its
+#       regex cost), which shows the patterns that dominate
+#
+# python lexbench.py --sizes 100K,1M --profile; --write PATH saves a corpus.
+
+SAMPLES = {
+    'NEW_LINE': ['\n'],
+    'NULL_DATATYPE': ['null'],
+    'BOOLEAN_DATATYPE': ['true', 'false'],
+    'CHAR_DATATYPE': ["'c'", '"x"'],
+    'STRING_DATATYPE': ['"hello"', "'two words'", '"line\\nbreak"', '""'],
+    'FLOAT_DATATYPE': ['3.14', '.5', '10.25'],
+    'INT_DATATYPE': ['0', '42', '1000'],
+    'MAIN_KEYWORDS': ['Main'],
+    'FUNCTION_KEYWORDS': ['func'],
+    'VARIABLE_KEYWORDS': ['let', 'var'],
+    'STATIC_KEYWORD': ['static'],
+    'LOOP_KEYWORDS': ['for', 'while'],
+    'CONDITIONAL_KEYWORDS': ['if', 'else if', 'elif', 'else'],
+    'ARRAY_STRING_OPERATIONS': ['concat', 'replace', 'find', 'len'],
+    'MATH_KEYWORDS': ['pow', 'sqrt', 'range'],
+    'CLASS_DECLARATION_KEYWORDS': ['class'],
+    'INITIALIZER_KEYWORDS': ['init', 'deinit'],
+    'INHERITANCE_KEYWORDS': ['super', 'abstract', 'this', 'override'],
+    'ACCESS_MODIFIERS_KEYWORDS': ['private', 'protected', 'public'],
+    'UTILITY_KEYWORDS': ['return', 'print', 'exit'],
+    'DATATYPE_KEYWORDS': ['int', 'float', 'char', 'str', 'bool'],
+    'IDENTIFIER': ['x', 'count', 'total_sum', 'Node2', '_tmp', 'elsewhere', 'iffy'],
+    'COMMENT': ['// note'],
+    'COMPARISON_OP': ['===', '==', '!==', '!=', '<=', '>=', '>', '<'],
+    'INC_DEC_OP': ['++', '--'],
+    'ASSIGNMENT_OP': ['+=', '-=', '*=', '%=', '='],
+    'POWER_OP': ['**'],
+    'MULTIPLICATIVE_OP': ['*', '/', '%'],
+    'ADDITIVE_OP': ['+', '-'],
+    'LOGICAL_OP': ['&&', '||'],
+    'COLON_OP': [':'],
+    'END_STATEMENT_OP': [';'],
+    'COMMA_OP': [','],
+    'DOT_OP': ['.'],
+    'PARENTHESIS_OP': ['(', ')'],
+    'BRACES_OP': ['{', '}'],
+    'BRACKETS_OP': ['[', ']'],
+    'NOT_OP': ['!'],
+    'SPACE': [' '],
+}
+
+# Samples that may appear inside a line (NEW_LINE and comments are placed
+# by generate itself), weighted towards identifiers and operators like code
+_WEIGHTED = ([sample for name, samples in SAMPLES.items()
+              if name not in ('NEW_LINE', 'COMMENT', 'SPACE') for sample in samples]
+             + SAMPLES['IDENTIFIER'] * 6 + ['=', ';', '(', ')', '.', ','] * 3)
+
+
+def generate(size, seed=0, distinct_lines=2000):
+    rng = random.Random(seed)
+    lines = []
+    for _ in range(distinct_lines):
+        line = ' '.join(rng.choice(_WEIGHTED) for _ in range(rng.randint(3, 12)))
+        if rng.random() < 0.15:
+            line += ' // ' + ' '.join(rng.choice(SAMPLES['IDENTIFIER']) for _ in range(rng.randint(1, 6)))
+        lines.append(line + '\n')
+    tail = '/* block\n   comment */\n'
+    parts = []
+    total = len(tail)
+    while total < size:
+        line = rng.choice(lines)
+        parts.append(line)
+        total += len(line)
+    parts.append(tail)
+    return ''.join(parts)
+
+
+def parse_size(text):
+    units = {'K': 1000, 'M': 1000 ** 2, 'G': 1000 ** 3}
+    text = text.strip().upper()
+    if text[-1:] in units:
+        return int(float(text[:-1]) * units[text[-1]])
+    return int(text)
+
+
+# Engines: each takes the source and returns its tokens, a sized sequence
+# of (type, value, line) like tokenize()
+
+
+def default_engines():
+    dfa = DFALexer.from_spec(TOKEN_TYPES)
+    return {
+        'tokenize': tokenize,
+        'iter_tokens': lambda source: list(iter_tokens(io.StringIO(source))),
+        'TokenStream': TokenStream.from_source,
+        'dfa_lexer': dfa.tokenize,
+        # Slices the source once per token: quadratic, small sizes only
+        'tokenize_reference': tokenize_reference,
+    }
+
+
+REFERENCE_LIMIT = 200000
+
+
+def run(sizes, engines=None, seed=0, memory=True, progress=None):
+    engines = engines or default_engines()
+    results = []
+    for size in sizes:
+        source = generate(size, seed)
+        expected = tokenize(source)
+        for name, engine in engines.items():
+            if name == 'tokenize_reference' and len(source) > REFERENCE_LIMIT:
+                continue
+            if list(engine(source)) != expected:
+                raise AssertionError(f"{name} returns different tokens from tokenize on {len(source):,} characters")
+            t0 = time.perf_counter()
+            count = len(engine(source))
+            seconds = time.perf_counter() - t0
+            peak = None
+            if memory:
+                tracemalloc.start()
+                engine(source)
+                peak = tracemalloc.get_traced_memory()[1]
+                tracemalloc.stop()
+            result = {'engine': name, 'characters': len(source), 'tokens': count,
+                      'seconds': seconds, 'peak_bytes': peak}
+            results.append(result)
+            if progress:
+                progress(result)
+    return results
+
+
+def profile_types(source, lexer=LEXER):
+    starts = defaultdict(list)
+    for kind, start, _, _ in lexer.spans(source, drop=False):
+        starts[kind].append(start)
+    match = lexer.pattern.match
+    total = 0.0
+    rows = []
+    for kind, positions in starts.items():
+        t0 = time.perf_counter()
+        for start in positions:
+            match(source, start)
+        seconds = time.perf_counter() - t0
+        total += seconds
+        rows.append((kind, len(positions), seconds))
+    rows.sort(key=lambda row: row[2], reverse=True)
+    return [(kind, count, seconds, seconds / total if total else 0.0) for kind, count, seconds in rows]
+
+
+def format_result(result):
+    seconds = result['seconds'] or 1e-9
+    peak = f"{result['peak_bytes'] / 1e6:>10.1f}" if result['peak_bytes'] is not None else f"{'-':>10}"
+    return (f"{result['engine']:<20}{result['characters'] / 1e6:>10.2f}{result['tokens']:>12,}"
+            f"{result['characters'] / seconds / 1e6:>9.2f}{result['tokens'] / seconds:>13,.0f}{peak}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the lexers on a synthetic corpus")
+    parser.add_argument('--sizes', default='100K,1M', help="comma-separated corpus sizes (K, M, G suffixes)")
+    parser.add_argument('--engines', default=None, help="comma-separated engine names (default: all)")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--no-memory', action='store_true', help="skip the tracemalloc peak memory run")
+    parser.add_argument('--profile', action='store_true', help="time per token type on the largest size")
+    parser.add_argument('--write', metavar='PATH', help="write a corpus of the first size to PATH and exit")
+    args = parser.parse_args(argv)
+    sizes = [parse_size(size) for size in args.sizes.split(',')]
+    if args.write:
+        with open(args.write, 'w') as file:
+            file.write(generate(sizes[0], args.seed))
+        return 0
+    engines = default_engines()
+    if args.engines:
+        unknown = set(args.engines.split(',')) - set(engines)
+        if unknown:
+            parser.error(f"unknown engines: {', '.join(sorted(unknown))}")
+        engines = {name: engines[name] for name in args.engines.split(',')}
+
+    print(f"{'engine':<20}{'MB':>10}{'tokens':>12}{'MB/s':>9}{'tokens/s':>13}{'peak MB':>10}")
+    run(sizes, engines, args.seed, not args.no_memory, progress=lambda result: print(format_result(result)))
+    if args.profile:
+        print(f"\n{'token type':<28}{'count':>10}{'seconds':>10}{'share':>8}")
+        for kind, count, seconds, share in profile_types(generate(max(sizes), args.seed)):
+            print(f"{kind:<28}{count:>10,}{seconds:>10.4f}{share:>8.1%}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
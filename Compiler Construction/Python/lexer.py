@@ -0,0 +1,270 @@
+import codecs
+import re
+
+# Lexer engine for TOKEN_TYPES-style specifications
+#
+# Lexer(token_types) compiles an ordered list of (name, pattern) pairs into a
+# single alternation of named groups and scans the source by position
+# (pattern.finditer(source, pos)), so nothing is ever sliced off the front of
+# the source. Results are the same as trying every pattern in order with
+# re.match on the remaining text:
+#   - a leading \b becomes (?=\w): at the start of the sliced text \b only
+#     required the first character to be a word character
+#   - keyword patterns of the form \b(word|word|...)\b are left out of the
+#     alternation; after IDENTIFIER matches, its text is looked up in a dict
+#     instead (and accepted only if a non-word character follows, like the
+#     trailing \b). Alternatives that are not plain words (else\s*if) and
+#     non-ASCII identifiers, which IGNORECASE can fold onto a keyword, are
+#     checked with the original patterns.
+# Line numbers follow tokenize() in main.py: NEW_LINE advances the line,
+# SPACE and COMMENT tokens are dropped (a comment advances the line by its
+# newlines), and a STRING_DATATYPE advances it by the escaped '\n' sequences
+# it contains, after the token is emitted.
+#
+# iter_tokens(chunks) lexes text that arrives in pieces (read_chunks reads
+# them from a file object or mmap) and yields the same tokens lazily. Each
+# round lexes the buffer up to its last newline; a newline always ends the
+# token before it, so only three kinds of token can still change once more
+# text arrives, and lexing resumes from the first of them:
+#   - a quote with no closing quote yet (it becomes a string once one shows
+#     up, or stays an unexpected character at the end of the input)
+#   - a word with a non-word keyword alternative (else\s*if) followed only by
+#     whitespace
+#   - a /* comment, which is greedy and runs to the last */ of the input: the
+#     rest of the input is read, counting its lines and keeping only the text
+#     after the latest */
+# Memory stays proportional to the longest line (or unterminated string)
+# rather than to the input.
+
+UNEXPECTED = "Unexpected character"
+
+_KEYWORD_PATTERN = re.compile(r'\\b\((.*)\)\\b$')
+_PLAIN_WORD = re.compile(r'[A-Za-z]+$')
+_WORD_PREFIX = re.compile(r'[A-Za-z]*')
+_CAPTURING_GROUP = re.compile(r'(?<!\\)\((?!\?)')
+
+
+def is_word_char(c):
+    # Same characters as \w on str patterns
+    return c.isalnum() or c == '_'
+
+
+def read_chunks(file, chunk_size=1 << 16, encoding='utf-8'):
+    # str chunks from a text file, a binary file or an mmap; bytes are decoded
+    # incrementally, so a multi-byte character may straddle two reads
+    decoder = None
+    while True:
+        chunk = file.read(chunk_size)
+        if isinstance(chunk, str):
+            if not chunk:
+                return
+            yield chunk
+            continue
+        if decoder is None:
+            decoder = codecs.getincrementaldecoder(encoding)()
+        text = decoder.decode(chunk, final=not chunk)
+        if text:
+            yield text
+        if not chunk:
+            return
+
+
+class Lexer:
+    def __init__(self, token_types, flags=re.IGNORECASE, identifier='IDENTIFIER', newline='NEW_LINE',
+                 skip=('SPACE',), comments=('COMMENT',), escaped_newlines=('STRING_DATATYPE',),
+                 quotes='"\'', block_comment=('/*', '*/')):
+        self.token_types = list(token_types)
+        self.identifier = identifier
+        self.newline = newline
+        self.skip = frozenset(skip)
+        self.comments = frozenset(comments)
+        self.escaped_newlines = frozenset(escaped_newlines)
+        self.dropped = self.skip | self.comments | {newline}
+        self.quotes = quotes
+        self.block_comment = block_comment
+        self.keywords = {}
+        # (kind, prefix) for keyword alternatives that are not plain words,
+        # and the full pattern of every keyword type, in declaration order
+        self._complex = []
+        self._keyword_patterns = []
+        order = {}
+        parts = []
+        for name, pattern in self.token_types:
+            keyword = _KEYWORD_PATTERN.match(pattern)
+            if keyword and '(' not in keyword.group(1):
+                order[name] = len(order)
+                self._keyword_patterns.append((name, re.compile('(?=\\w)' + pattern[2:], flags)))
+                for alternative in keyword.group(1).split('|'):
+                    if _PLAIN_WORD.match(alternative):
+                        self.keywords.setdefault(alternative.lower(), name)
+                    else:
+                        prefix = _WORD_PREFIX.match(alternative).group(0).lower()
+                        self._complex.append((name, prefix))
+                continue
+            if pattern.startswith('\\b'):
+                pattern = '(?=\\w)' + pattern[2:]
+            parts.append(f'(?P<{name}>{_CAPTURING_GROUP.sub("(?:", pattern)})')
+        self._order = order
+        # Kinds _unsettled has to look at
+        self._watched = self.comments | {UNEXPECTED}
+        if self._complex:
+            self._watched |= {identifier} | set(order)
+        self.pattern = re.compile('|'.join(parts), flags)
+
+    def _keyword(self, source, start, end):
+        # Returns (kind, end) for the identifier source[start:end]
+        word = source[start:end]
+        if not word.isascii():
+            return self._match_keywords(source, start, end, self._keyword_patterns)
+        lowered = word.lower()
+        kind = self.keywords.get(lowered)
+        if kind is not None and end < len(source) and is_word_char(source[end]):
+            kind = None
+        candidates = [name for name, prefix in self._complex if lowered.startswith(prefix)]
+        if not candidates:
+            return (kind, end) if kind is not None else (self.identifier, end)
+        if kind is not None:
+            candidates.append(kind)
+        # Rare: a keyword with a non-word alternative may apply; the original
+        # patterns decide, in declaration order
+        candidates.sort(key=self._order.__getitem__)
+        patterns = [(name, pattern) for name, pattern in self._keyword_patterns if name in candidates]
+        return self._match_keywords(source, start, end, patterns)
+
+    def _match_keywords(self, source, start, end, patterns):
+        for name, pattern in patterns:
+            match = pattern.match(source, start)
+            if match:
+                return name, match.end()
+        return self.identifier, end
+
+    def spans(self, source, pos=0, line=1, drop=True):
+        # Yields (kind, start, end, line) for every emitted token from pos on,
+        # and returns the line number reached at the end of the source. With
+        # drop=False the SPACE, NEW_LINE and COMMENT tokens are yielded too.
+        # finditer resumes the search right after each match, and its search
+        # semantics step over characters no pattern matches one at a time, just
+        # like the original loop: those gaps are reported as unexpected.
+        finditer = self.pattern.finditer
+        identifier = self.identifier
+        newline = self.newline
+        skip = self.skip
+        comments = self.comments
+        escaped = self.escaped_newlines
+        while True:
+            for m in finditer(source, pos):
+                start = m.start()
+                while pos < start:
+                    yield UNEXPECTED, pos, pos + 1, line
+                    pos += 1
+                kind = m.lastgroup
+                end = m.end()
+                if kind in skip:
+                    if not drop:
+                        yield kind, start, end, line
+                elif kind == newline:
+                    if not drop:
+                        yield kind, start, end, line
+                    line += 1
+                elif kind in comments:
+                    if not drop:
+                        yield kind, start, end, line
+                    line += source.count('\n', start, end)
+                else:
+                    if kind == identifier:
+                        kind, end = self._keyword(source, start, end)
+                    yield kind, start, end, line
+                    if kind in escaped:
+                        line += source.count('\\n', start, end)
+                pos = end
+                if end != m.end():
+                    # A keyword (else if) ran past the match: rescan from its end
+                    break
+            else:
+                break
+        for pos in range(pos, len(source)):
+            yield UNEXPECTED, pos, pos + 1, line
+        return line
+
+    def tokenize(self, source):
+        return [(kind, source[start:end], line) for kind, start, end, line in self.spans(source)]
+
+    # Streaming
+
+    def iter_tokens(self, chunks):
+        chunks = iter(chunks)
+        dropped = self.dropped
+        watched = self._watched
+        buffer = ''
+        line = 1
+        eof = False
+        while True:
+            chunk = next(chunks, None)
+            if chunk is None:
+                eof = True
+            else:
+                buffer += chunk
+            cut = len(buffer) if eof else buffer.rfind('\n') + 1
+            if cut == 0:
+                if eof:
+                    return
+                continue
+            text = buffer[:cut]
+            tokens = self.spans(text, 0, line, drop=False)
+            held = None
+            while True:
+                try:
+                    kind, start, end, token_line = next(tokens)
+                except StopIteration as stop:
+                    line = stop.value
+                    break
+                if kind in watched and not eof and self._unsettled(text, kind, start, end):
+                    held = start
+                    line = token_line
+                    break
+                if kind not in dropped:
+                    yield kind, text[start:end], token_line
+            if eof:
+                return
+            if held is None:
+                buffer = buffer[cut:]
+            elif kind in self.comments:
+                buffer, line = self._skip_block_comment(buffer, held, line, chunks)
+            else:
+                buffer = buffer[held:]
+
+    def _unsettled(self, text, kind, start, end):
+        # True if the token could lex differently with more text after text
+        if kind in self.comments:
+            return text.startswith(self.block_comment[0], start)
+        if kind == UNEXPECTED:
+            return text[start] in self.quotes
+        if self._complex:
+            lowered = text[start:end].lower()
+            if any(lowered.startswith(prefix) for _, prefix in self._complex):
+                return end == len(text) or text[end:].isspace()
+        return False
+
+    def _skip_block_comment(self, buffer, start, line, chunks):
+        # Consumes the rest of chunks; returns the text after the comment and
+        # the line it starts on
+        opening, closing = self.block_comment
+        tail = buffer[start + len(opening):]
+        searched = 0
+        found = False
+        while True:
+            k = tail.rfind(closing, searched)
+            if k >= 0:
+                k += len(closing)
+                line += tail.count('\n', 0, k)
+                tail = tail[k:]
+                found = True
+            searched = max(0, len(tail) - len(closing) + 1)
+            chunk = next(chunks, None)
+            if chunk is None:
+                break
+            tail += chunk
+        if not found:
+            line += tail.count('\n')
+            tail = ''
+        return tail, line
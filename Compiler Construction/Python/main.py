@@ -1,5 +1,7 @@
 import re
 
+from lexer import Lexer, read_chunks
+
 # Define token types
 TOKEN_TYPES = [
     ('NEW_LINE', r'\n'),
@@ -44,7 +46,21 @@ TOKEN_TYPES = [
     ('SPACE', r' ')
 ]
 
+# Compiled once: one master regex plus a keyword dict (see lexer.py)
+LEXER = Lexer(TOKEN_TYPES)
+
+
 def tokenize(source_code):
+    return LEXER.tokenize(source_code)
+
+
+# Lazy version over a file object or mmap, read chunk_size at a time
+def iter_tokens(file, chunk_size=1 << 16):
+    return LEXER.iter_tokens(read_chunks(file, chunk_size))
+
+
+# Original pattern-by-pattern tokenizer, kept as the reference behaviour
+def tokenize_reference(source_code):
     tokens = []
     line_no = 1
     while source_code:
@@ -76,7 +92,5 @@ def tokenize(source_code):
 
 if __name__ == '__main__':
     with open("mySourceCode.txt", "r") as file:
-        source_code = file.read()
-    tokens = tokenize(source_code)
-    for token_type, value, line_no in tokens:
-        print([token_type, value, line_no])
\ No newline at end of file
+        for token_type, value, line_no in iter_tokens(file):
+            print([token_type, value, line_no])
\ No newline at end of file
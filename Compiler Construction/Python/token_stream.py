@@ -0,0 +1,135 @@
+import struct
+import sys
+import time
+import tracemalloc
+from array import array
+
+from lexer import UNEXPECTED
+from main import LEXER, tokenize
+
+# Compact token stream
+#
+# TokenStream.from_source(source) lexes like tokenize() but stores each token
+# as a type id in array('B') and its start, end and line in array('I')
+# ('Q' for sources of 4 GiB or more), about 13 bytes per token, next to a
+# single reference to the source. Values are sliced out of the source only
+# when a token is accessed: stream[i] and iteration give the same
+# (type, value, line) tuples as tokenize(), and kind()/value()/line()/span()
+# read one field without building the tuple. to_bytes()/from_bytes() pack
+# the arrays (native byte order) for caches and for passing streams between
+# processes; the source itself is not included.
+
+_HEADER = struct.Struct('<4scI')
+
+
+class TokenStream:
+    def __init__(self, source, types, kinds, starts, ends, lines):
+        self.source = source
+        self.types = types
+        self.kinds = kinds
+        self.starts = starts
+        self.ends = ends
+        self.lines = lines
+
+    @classmethod
+    def from_source(cls, source, lexer=LEXER):
+        types = token_names(lexer)
+        ids = {name: i for i, name in enumerate(types)}
+        wide = 'I' if len(source) < 2 ** 32 else 'Q'
+        kinds, starts, ends, lines = array('B'), array(wide), array(wide), array(wide)
+        add_kind, add_start, add_end, add_line = kinds.append, starts.append, ends.append, lines.append
+        for kind, start, end, line in lexer.spans(source):
+            add_kind(ids[kind])
+            add_start(start)
+            add_end(end)
+            add_line(line)
+        return cls(source, types, kinds, starts, ends, lines)
+
+    def to_bytes(self):
+        parts = [_HEADER.pack(b'TOK1', self.starts.typecode.encode(), len(self))]
+        parts += [a.tobytes() for a in (self.kinds, self.starts, self.ends, self.lines)]
+        return b''.join(parts)
+
+    @classmethod
+    def from_bytes(cls, data, source, lexer=LEXER):
+        magic, wide, n = _HEADER.unpack_from(data)
+        if magic != b'TOK1':
+            raise ValueError("not a packed token stream")
+        wide = wide.decode()
+        arrays = [array('B'), array(wide), array(wide), array(wide)]
+        pos = _HEADER.size
+        for a in arrays:
+            size = a.itemsize * n
+            a.frombytes(data[pos:pos + size])
+            pos += size
+        return cls(source, token_names(lexer), *arrays)
+
+    def __len__(self):
+        return len(self.kinds)
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return [self[j] for j in range(*i.indices(len(self)))]
+        return self.types[self.kinds[i]], self.source[self.starts[i]:self.ends[i]], self.lines[i]
+
+    def __iter__(self):
+        source = self.source
+        types = self.types
+        for kind, start, end, line in zip(self.kinds, self.starts, self.ends, self.lines):
+            yield types[kind], source[start:end], line
+
+    def kind(self, i):
+        return self.types[self.kinds[i]]
+
+    def value(self, i):
+        return self.source[self.starts[i]:self.ends[i]]
+
+    def line(self, i):
+        return self.lines[i]
+
+    def span(self, i):
+        return self.starts[i], self.ends[i]
+
+    def nbytes(self):
+        # Memory held by the token arrays (the source is shared, not counted)
+        return sum(a.itemsize * len(a) for a in (self.kinds, self.starts, self.ends, self.lines))
+
+
+def token_names(lexer):
+    # Type names by id: every emitted type in spec order, then UNEXPECTED
+    return [name for name, _ in lexer.token_types if name not in lexer.dropped] + [UNEXPECTED]
+
+
+# Benchmark: memory and time against the list of tuples
+
+
+def measure(build):
+    tracemalloc.start()
+    t0 = time.perf_counter()
+    result = build()
+    seconds = time.perf_counter() - t0
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return result, size, seconds
+
+
+def benchmark(path="mySourceCode.txt", size=2000000):
+    with open(path) as file:
+        unit = file.read().replace('/*', '//')
+    source = unit * max(1, size // len(unit))
+    tokens, list_bytes, list_seconds = measure(lambda: tokenize(source))
+    stream, stream_bytes, stream_seconds = measure(lambda: TokenStream.from_source(source))
+    if list(stream) != tokens:
+        raise AssertionError("TokenStream differs from tokenize")
+    return [('tokenize (list of tuples)', len(tokens), list_bytes, list_seconds),
+            ('TokenStream', len(stream), stream_bytes, stream_seconds),
+            ('source text', len(source), sys.getsizeof(source), 0.0)]
+
+
+if __name__ == "__main__":
+    stream = TokenStream.from_source('let x = "hi";\nprint(x);\n')
+    print(len(stream), "tokens:", stream[:4], stream.kind(5), stream.value(5), stream.line(5))
+
+    print(f"{'representation':<28}{'items':>10}{'bytes':>14}{'seconds':>10}")
+    for name, count, nbytes, seconds in benchmark():
+        print(f"{name:<28}{count:>10,}{nbytes:>14,}{seconds:>10.3f}")
@@ -1,58 +1,314 @@
-from prettytable import PrettyTable
+import argparse
+import csv
+import sys
+import time
 
-def initialize():
-    global name, A, M, C, Z, minPriority, maxPriority, simulation, precision, arrSimulation, arrZ, arrR, arrRand, arrPriority
-    
-    # name  = "LCG"
-    # A = 55
-    # M = 1994
-    # C = 9
-    # Z = 10112166
-    # minPriority = 1
-    # maxPriority = 3
-    # simulation = 10
-    # precision = 5
-
-    name = input("Enter name: ")
-    A = int(input("Enter A: "))
-    M = int(input("Enter M: "))
-    C = int(input("Enter C: "))
-    Z = 10112166
-    minPriority = 1
-    maxPriority = int(input("Enter priority 1 to "))
-    simulation = int(input("Enter number of simulations: "))
-    precision = int(input("Enter decimal precision: "))
-
-    arrSimulation = []
-    arrZ = []
-    arrR = []
-    arrRand = []
-    arrPriority = []
-
-def push(no, Z, R, Rand, Priority):
-    arrSimulation.append(no)
-    arrZ.append(Z)
-    arrR.append(R)
-    arrRand.append(Rand)
-    arrPriority.append(Priority)
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# LCG engine
+#
+# Each step is R = (A * Z + C) % M, then Z = R: the affine map f(x) = A*x + C
+# modulo M. Composing affine maps gives another one, so f^k is found by
+# repeated squaring in O(log k) multiplications (affine_power), which is how
+# jump(k) skips k steps.
+# generate(n) fills a NumPy array by doubling: with the first m values known,
+# the next m are a*x + c for the (a, c) of f^m, one vectorized operation per
+# doubling. Values stay exact: uint64 while M <= 2^32 (products of two
+# residues fit in 64 bits) or M == 2^64 (uint64 wraps around modulo M),
+# Python ints in an object array otherwise.
+
+
+def compose(a1, c1, a2, c2, M):
+    # (a, c) of x -> a1*(a2*x + c2) + c1
+    return a1 * a2 % M, (a1 * c2 + c1) % M
+
+
+def affine_power(A, C, M, k):
+    a, c = 1 % M, 0
+    base_a, base_c = A % M, C % M
+    while k:
+        if k & 1:
+            a, c = compose(base_a, base_c, a, c, M)
+        base_a, base_c = compose(base_a, base_c, base_a, base_c, M)
+        k >>= 1
+    return a, c
+
+
+class LCG:
+    def __init__(self, A, M, C, Z):
+        if M <= 0:
+            raise ValueError("M must be positive")
+        self.A = A
+        self.M = M
+        self.C = C
+        self.Z = Z
+
+    def step(self):
+        self.Z = (self.A * self.Z + self.C) % self.M
+        return self.Z
+
+    def jump(self, k):
+        if k < 0:
+            raise ValueError("cannot jump backwards")
+        a, c = affine_power(self.A, self.C, self.M, k)
+        self.Z = (a * self.Z + c) % self.M
+        return self
+
+    def generate(self, n):
+        # The next n values of R; the state ends on the last one
+        if np is None:
+            return [self.step() for _ in range(n)]
+        A, M, C = self.A, self.M, self.C
+        wraps = M == 2 ** 64
+        exact = M <= 2 ** 32 or wraps
+        out = np.empty(max(n, 0), dtype=np.uint64 if exact else object)
+        if n <= 0:
+            return out
+        out[0] = (A * self.Z + C) % M
+        filled = 1
+        while filled < n:
+            m = min(filled, n - filled)
+            a, c = affine_power(A, C, M, filled)
+            if exact:
+                a, c, M_ = np.uint64(a), np.uint64(c), np.uint64(M % 2 ** 64)
+                np.multiply(out[:m], a, out=out[filled:filled + m])
+                out[filled:filled + m] += c
+                if not wraps:
+                    out[filled:filled + m] %= M_
+            else:
+                out[filled:filled + m] = (out[:m] * a + c) % M
+            filled += m
+        self.Z = int(out[-1])
+        return out
+
+    def uniform(self, n):
+        # The next n values of R / M
+        values = self.generate(n)
+        if np is None:
+            return [value / self.M for value in values]
+        return values.astype(np.float64) / self.M
+
+
+def benchmark(A=1103515245, M=2 ** 31, C=12345, Z=10112166, n=10 ** 7, far=10 ** 9):
+    results = []
+    loop_n = min(n, 10 ** 6)
+    t0 = time.perf_counter()
+    z = Z
+    expected = []
+    for _ in range(loop_n):
+        z = (A * z + C) % M
+        expected.append(z)
+    results.append(('python loop', loop_n, time.perf_counter() - t0))
+    t0 = time.perf_counter()
+    values = LCG(A, M, C, Z).generate(n)
+    results.append(('generate', n, time.perf_counter() - t0))
+    if [int(v) for v in values[:loop_n]] != expected:
+        raise AssertionError("generate disagrees with the step loop")
+    t0 = time.perf_counter()
+    LCG(A, M, C, Z).jump(far)
+    results.append((f'jump({far:.0e})', far, time.perf_counter() - t0))
+    rng = LCG(A, M, C, Z).jump(loop_n)
+    if rng.Z != expected[-1]:
+        raise AssertionError("jump disagrees with the step loop")
+    for label, big in (('generate (M = 2^64)', LCG(6364136223846793005, 2 ** 64, 1442695040888963407, Z)),
+                       ('generate (M = 2^61-1)', LCG(48271, 2 ** 61 - 1, 0, Z))):
+        t0 = time.perf_counter()
+        wide = big.generate(n // 10)
+        results.append((label, n // 10, time.perf_counter() - t0))
+        check = LCG(big.A, big.M, big.C, Z)
+        if [int(v) for v in wide[:1000]] != [check.step() for _ in range(1000)] or big.Z != int(wide[-1]):
+            raise AssertionError(f"{label} disagrees with the step loop")
+    return results
+
+
+# Simulation rows
+#
+# simulate(...) yields the table one chunk at a time as five columns
+# (simulation, Z, R, random number, priority), computed exactly like the
+# original loop: R = (A*Z + C) % M, X = round(R/M, precision),
+# Y = int(round((max - min)*X + min, 0)), Z = R. The engine starts from the
+# seed reduced modulo M (R is the same for Z and Z % M), but the first row
+# still shows the seed as given, like the loop. Only the npy and bin
+# formats, whose Z column is uint64, store a seed outside 0..2^64-1 reduced
+# modulo M. Writers consume the chunks, so memory stays at one chunk
+# whatever the number of simulations:
+#   - csv: one row per simulation
+#   - npy: a .npy file of ROW_DTYPE records (np.load(path, mmap_mode='r')
+#     maps it back without reading it all)
+#   - bin: raw ROW_DTYPE records, readable with np.memmap(path, ROW_DTYPE)
+#   - table: the PrettyTable view, for small runs
+# Run with arguments (python lcg.py -A 55 -M 1994 -C 9 --max-priority 3
+# -n 1000000 --format npy -o out.npy) or without any to be prompted;
+# --self-check compares simulate with the step loop.
+
+FIELDS = ["Simulation", "Z", "R (LCG)", "Random Number (X)", "Priority (Y)"]
+ROW_DTYPE = None if np is None else np.dtype([('simulation', '<i8'), ('Z', '<u8'), ('R', '<u8'),
+                                              ('rand', '<f8'), ('priority', '<i8')])
+
+
+def _round(values, M, precision):
+    # round(R / M, precision) for every R. np.round multiplies by
+    # 10**precision first, which can land exactly on .5 where round() (on the
+    # exact binary value) would not, so near-ties are redone with round()
+    if np is None or M > 2 ** 53 or precision > 9:
+        return [round(int(r) / M, precision) for r in values]
+    x = values.astype(np.float64) / M
+    out = np.round(x, precision)
+    scaled = x * 10.0 ** precision
+    for i in np.flatnonzero(np.abs(scaled - np.floor(scaled) - 0.5) < 1e-6):
+        out[i] = round(float(x[i]), precision)
+    return out
 
-if __name__ == "__main__":
-    # Q -> Generate Probability And Pseudo Random Numbers Using LCG
-    initialize()
-    for i in range(simulation):
-        no = i + 1
-        R = (A * Z + C) % M
-        Rand = round(R / M, precision)
-        Priority = int(round((maxPriority - minPriority) * Rand + minPriority, 0))
-        push(no, Z, R, Rand, Priority)
-        Z = R
 
+def simulate(A, M, C, Z, simulations, precision, min_priority=1, max_priority=3, chunk_size=1 << 20):
+    engine = LCG(A, M, C, Z % M)
+    done = 0
+    while done < simulations:
+        n = min(chunk_size, simulations - done)
+        previous = engine.Z
+        R = engine.generate(n)
+        rand = _round(R, M, precision)
+        if np is None:
+            numbers = list(range(done + 1, done + n + 1))
+            Zs = [Z if done == 0 else previous] + R[:-1]
+            priority = [int(round((max_priority - min_priority) * x + min_priority, 0)) for x in rand]
+        else:
+            numbers = np.arange(done + 1, done + n + 1, dtype=np.int64)
+            Zs = np.empty(n, dtype=R.dtype)
+            Zs[0] = previous
+            Zs[1:] = R[:-1]
+            if done == 0 and Z != previous:
+                if not 0 <= Z < 2 ** 64:
+                    Zs = Zs.astype(object)
+                Zs[0] = Z
+            rand = np.asarray(rand, dtype=np.float64)
+            priority = np.rint((max_priority - min_priority) * rand + min_priority).astype(np.int64)
+        yield numbers, Zs, R, rand, priority
+        done += n
+
+
+def write_csv(chunks, file):
+    writer = csv.writer(file)
+    writer.writerow(FIELDS)
+    for columns in chunks:
+        writer.writerows(zip(*(column.tolist() if np is not None else column for column in columns)))
+
+
+def _records(columns):
+    records = np.empty(len(columns[0]), dtype=ROW_DTYPE)
+    for name, column in zip(ROW_DTYPE.names, columns):
+        records[name] = column
+    return records
+
+
+def write_npy(chunks, path, simulations):
+    if np is None:
+        raise ImportError("writing .npy files requires NumPy")
+    header = {'descr': np.lib.format.dtype_to_descr(ROW_DTYPE), 'fortran_order': False, 'shape': (simulations,)}
+    with open(path, 'wb') as file:
+        np.lib.format.write_array_header_1_0(file, header)
+        write_binary(chunks, file)
+
+
+def write_binary(chunks, file):
+    if np is None:
+        raise ImportError("writing binary records requires NumPy")
+    for columns in chunks:
+        file.write(_records(columns).tobytes())
+
+
+def print_table(chunks, name):
+    from prettytable import PrettyTable
     table = PrettyTable()
     table.title = name
-    table.field_names = ["Simulation", "Z", "R (LCG)", "Random Number (X)", "Priority (Y)"]
+    table.field_names = FIELDS
+    for columns in chunks:
+        for row in zip(*(column.tolist() if np is not None else column for column in columns)):
+            table.add_row(list(row))
+    print(table)
+
 
-    # Add rows to the table
-    for i in range(len(arrSimulation)):
-        table.add_row([arrSimulation[i], arrZ[i], arrR[i], arrRand[i], arrPriority[i]])
+def run(args):
+    if args.M > 2 ** 64 and args.format in ('npy', 'bin'):
+        raise ValueError("binary output stores Z and R as 64-bit integers, so M must be at most 2^64")
+    seed = args.Z
+    if args.format in ('npy', 'bin') and not 0 <= seed < 2 ** 64:
+        seed %= args.M
+    chunks = simulate(args.A, args.M, args.C, seed, args.simulations, args.precision,
+                      args.min_priority, args.max_priority, args.chunk_size)
+    if args.format == 'table':
+        print_table(chunks, args.name)
+    elif args.format == 'csv':
+        if args.output in (None, '-'):
+            write_csv(chunks, sys.stdout)
+        else:
+            with open(args.output, 'w', newline='') as file:
+                write_csv(chunks, file)
+    elif args.output in (None, '-'):
+        raise ValueError(f"--format {args.format} needs --output PATH")
+    elif args.format == 'npy':
+        write_npy(chunks, args.output, args.simulations)
+    else:
+        with open(args.output, 'wb') as file:
+            write_binary(chunks, file)
 
-    print(table)
\ No newline at end of file
+
+def self_check():
+    # Rows against the original step loop, including seeds outside 0..M-1
+    for A, M, C, Z, precision in ((55, 1994, 9, 10112166, 5), (55, 1994, 9, -5, 5), (7, 1000, 3, 2 ** 64 + 3, 2),
+                                  (1103515245, 2 ** 31, 12345, 1, 3), (5, 2 ** 70 + 1, 3, -11, 4)):
+        expected = []
+        z = Z
+        for i in range(1000):
+            R = (A * z + C) % M
+            rand = round(R / M, precision)
+            expected.append([i + 1, z, R, rand, int(round((3 - 1) * rand + 1, 0))])
+            z = R
+        rows = []
+        for columns in simulate(A, M, C, Z, 1000, precision, 1, 3, chunk_size=333):
+            rows += [list(row) for row in zip(*(list(column) if np is None else column.tolist()
+                                                 for column in columns))]
+        if rows != expected:
+            raise AssertionError(f"simulate differs from the step loop (A={A}, M={M}, Z={Z})")
+
+
+def initialize():
+    # The original interactive prompts; the rest keeps its defaults
+    return parse_args([
+        '--name', input("Enter name: "),
+        '-A', input("Enter A: "),
+        '-M', input("Enter M: "),
+        '-C', input("Enter C: "),
+        '--max-priority', input("Enter priority 1 to "),
+        '--simulations', input("Enter number of simulations: "),
+        '--precision', input("Enter decimal precision: "),
+    ])
+
+
+def parse_args(argv):
+    parser = argparse.ArgumentParser(description="Generate probabilities and pseudo random numbers using an LCG")
+    parser.add_argument('--name', default="LCG", help="table title")
+    parser.add_argument('-A', type=int, required=True, help="multiplier")
+    parser.add_argument('-M', type=int, required=True, help="modulus")
+    parser.add_argument('-C', type=int, required=True, help="increment")
+    parser.add_argument('-Z', type=int, default=10112166, help="seed")
+    parser.add_argument('--min-priority', type=int, default=1)
+    parser.add_argument('--max-priority', type=int, default=3)
+    parser.add_argument('-n', '--simulations', type=int, required=True)
+    parser.add_argument('--precision', type=int, default=5, help="decimal places of the random numbers")
+    parser.add_argument('--format', choices=('table', 'csv', 'npy', 'bin'), default='table')
+    parser.add_argument('-o', '--output', default=None, help="output path (csv defaults to stdout)")
+    parser.add_argument('--chunk-size', type=int, default=1 << 20, help="rows generated at a time")
+    return parser.parse_args(argv)
+
+
+if __name__ == "__main__":
+    # Q -> Generate Probability And Pseudo Random Numbers Using LCG
+    if sys.argv[1:] == ['--self-check']:
+        self_check()
+        print("simulate matches the step loop")
+    else:
+        run(parse_args(sys.argv[1:]) if len(sys.argv) > 1 else initialize())
@@ -0,0 +1,141 @@
+import os
+import time
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+
+from lcg import LCG, affine_power, np
+
+# Parallel LCG streams
+#
+# The serial stream is x_j = f^(j+1)(Z), j = 0, 1, ..., the values
+# LCG(A, M, C, Z).generate(n) returns. A Substream names the elements
+# start, start + stride, start + 2*stride, ... (count of them):
+#   - block_split(n, parts) gives each part one contiguous range of indices
+#     (stride 1); the ranges partition 0..n-1, so no two parts share an
+#     element, and concatenating the parts in order is the serial stream
+#   - leapfrog_split(n, parts) gives part i the indices congruent to i
+#     modulo parts (stride = parts); the residue classes are disjoint, and
+#     interleave() puts the parts back in serial order
+# A substream is generated by jumping to x_start in O(log start) and then
+# running the LCG of f^stride (itself an affine map, from affine_power), so
+# every worker produces exactly the serial values for its indices with no
+# coordination. Substreams are plain tuples and pickle cheaply for process
+# pools.
+
+Substream = namedtuple('Substream', 'A M C Z start stride count')
+
+
+def block_split(A, M, C, Z, n, parts):
+    size, extra = divmod(n, parts)
+    streams = []
+    start = 0
+    for i in range(parts):
+        count = size + (i < extra)
+        streams.append(Substream(A, M, C, Z, start, 1, count))
+        start += count
+    return streams
+
+
+def leapfrog_split(A, M, C, Z, n, parts):
+    return [Substream(A, M, C, Z, i, parts, len(range(i, n, parts))) for i in range(parts)]
+
+
+def substream_values(stream):
+    A, M, C, Z, start, stride, count = stream
+    if count <= 0:
+        return LCG(A, M, C, Z).generate(0)
+    first = LCG(A, M, C, Z).jump(start + 1).Z
+    a, c = affine_power(A, C, M, stride)
+    rest = LCG(a, M, c, first).generate(count - 1)
+    if np is None:
+        return [first] + rest
+    values = np.empty(count, dtype=rest.dtype)
+    values[0] = first
+    values[1:] = rest
+    return values
+
+
+def concatenate(parts):
+    if np is None:
+        return [value for part in parts for value in part]
+    return np.concatenate(parts)
+
+
+def interleave(parts):
+    n = sum(len(part) for part in parts)
+    if np is None:
+        out = [None] * n
+    else:
+        out = np.empty(n, dtype=parts[0].dtype if parts else np.uint64)
+    for i, part in enumerate(parts):
+        out[i::len(parts)] = part
+    return out
+
+
+# Scaling benchmark: an exact reduction (the integer sum of every value) so
+# the parallel result can be compared with the serial one bit for bit
+
+
+def exact_sum(values):
+    # A uint64 values.sum() wraps modulo 2^64, so the high and low 32-bit
+    # halves are summed separately: each half sum stays below 2^64 for fewer
+    # than 2^32 values per slice
+    if np is None or values.dtype == object:
+        return int(sum(values))
+    total = 0
+    for i in range(0, len(values), 1 << 31):
+        part = values[i:i + (1 << 31)]
+        total += (int((part >> np.uint64(32)).sum()) << 32) + int((part & np.uint64(0xFFFFFFFF)).sum())
+    return total
+
+
+def _substream_sum(stream):
+    return exact_sum(substream_values(stream))
+
+
+def scaling(A=1103515245, M=2 ** 31, C=12345, Z=10112166, n=2 * 10 ** 8, workers=None, split=block_split):
+    if workers is None:
+        workers = sorted({1, 2, 4, os.cpu_count() or 1})
+    expected = None
+    results = []
+    for count in workers:
+        # Several substreams per worker keep each array small
+        streams = split(A, M, C, Z, n, count * 8)
+        t0 = time.perf_counter()
+        if count == 1:
+            total = sum(map(_substream_sum, streams))
+        else:
+            with ProcessPoolExecutor(count) as pool:
+                total = sum(pool.map(_substream_sum, streams))
+        seconds = time.perf_counter() - t0
+        if expected is None:
+            expected = total
+        elif total != expected:
+            raise AssertionError(f"{count} workers disagree with the serial sum")
+        results.append((count, seconds))
+    return results
+
+
+def self_check():
+    for A, M, C, Z in ((55, 1994, 9, 10112166), (1103515245, 2 ** 31, 12345, 1), (48271, 2 ** 61 - 1, 0, 7),
+                       (6364136223846793005, 2 ** 64, 1442695040888963407, 3)):
+        for n in (0, 1, 7, 1000, 4099):
+            serial = [int(v) for v in LCG(A, M, C, Z).generate(n)]
+            for parts in (1, 3, 8):
+                blocks = concatenate([substream_values(s) for s in block_split(A, M, C, Z, n, parts)])
+                frogs = interleave([substream_values(s) for s in leapfrog_split(A, M, C, Z, n, parts)])
+                if [int(v) for v in blocks] != serial or [int(v) for v in frogs] != serial:
+                    raise AssertionError(f"substreams differ from the serial stream (M={M}, n={n}, parts={parts})")
+                total = sum(_substream_sum(s) for s in block_split(A, M, C, Z, n, parts))
+                if total != sum(serial):
+                    raise AssertionError(f"substream sums differ from the exact sum (M={M}, n={n}, parts={parts})")
+
+
+if __name__ == "__main__":
+    self_check()
+    print("Substreams match the serial stream")
+    for name, split in (('block', block_split), ('leapfrog', leapfrog_split)):
+        results = scaling(split=split)
+        base = results[0][1]
+        for count, seconds in results:
+            print(f"{name:<10}{count:>3} workers {seconds:>8.3f}s  speedup {base / seconds:>5.2f}x")